@@ -1,9 +1,20 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Depends, Header
-from fastapi.responses import PlainTextResponse, JSONResponse
+import asyncio
+import itertools
+import posixpath
+import re
+from typing import Iterable, Iterator
+from urllib.parse import unquote, urlsplit
+
+import httpx
+import numpy as np
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from app.models.schemas import (
+    TranscriptSegment,
     TranscriptResponse,
     SummaryResponse,
     ChaptersResponse,
@@ -14,106 +25,156 @@ from app.models.schemas import (
     EntitiesResponse,
     ChatRequest,
     ChatResponse,
+    InsightsResponse,
+    BatchRequest,
+    BatchRequestItem,
+    BatchResponse,
+    BatchResponseItem,
 )
-from app.services.transcript import get_transcript_pipeline, segments_to_text
+from app.services.transcript import get_transcript_pipeline
 from app.services.ai import summarize, chapters as ai_chapters, takeaways as ai_takeaways, answer as ai_answer, entities as ai_entities
 from app.services.ai import chapters_from_segments
+from app.services.ai import ai_bundle, use_ai_bundle
 from app.services.ai import grounded_chat
 from app.services.ai import override_openai_key_for_request
 from app.core.limits import guard_request
+from app.core.responses import ORJSONResponse
 
 
 router = APIRouter()
 
 
-@router.get("/transcript/{video_id}", response_model=TranscriptResponse, dependencies=[Depends(guard_request)])
-async def get_transcript(video_id: str) -> TranscriptResponse:
-    segments, source, lang = get_transcript_pipeline(video_id)
+async def _load_transcript(video_id: str) -> tuple[list[TranscriptSegment], str, str, str | None]:
+    # The pipeline does blocking network/subprocess work; keep it off the event loop
+    segments, text, source, lang = await run_in_threadpool(get_transcript_pipeline, video_id)
     if not segments:
         raise HTTPException(status_code=404, detail="Transcript not available")
-    return TranscriptResponse(
+    return segments, text, source, lang
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _clamp_chapters(items: list[tuple[str, float]], duration: float | None) -> list[ChapterItem]:
+    # Drop non-numeric starts, then clamp the rest to [0, duration] in one vectorized pass
+    parsed = [(str(t), _as_float(s)) for t, s in items]
+    valid = [(t, s) for t, s in parsed if s is not None]
+    if not valid:
+        return []
+    upper = max(0.0, float(duration)) if duration is not None else np.inf
+    starts = np.clip(np.array([s for _, s in valid], dtype=np.float64), 0.0, upper)
+    return [ChapterItem.model_construct(title=t, start=v) for (t, _), v in zip(valid, starts.tolist())]
+
+
+@router.get("/transcript/{video_id}", response_model=TranscriptResponse, dependencies=[Depends(guard_request)])
+async def get_transcript(video_id: str) -> TranscriptResponse:
+    segments, text, source, lang = await _load_transcript(video_id)
+    return TranscriptResponse.model_construct(
         video_id=video_id,
         source=source,
         language=lang,
         segments=segments,
-        text=segments_to_text(segments),
+        text=text,
     )
 
 
 @router.get("/summary/{video_id}", response_model=SummaryResponse, dependencies=[Depends(guard_request)])
 async def get_summary(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> SummaryResponse:
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, source, lang = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        return SummaryResponse(video_id=video_id, summary=summarize(text))
+        return SummaryResponse.model_construct(video_id=video_id, summary=await summarize(text))
 
 
 @router.get("/chapters/{video_id}", response_model=ChaptersResponse, dependencies=[Depends(guard_request)])
 async def get_chapters(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> ChaptersResponse:
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, _, source, lang = await _load_transcript(video_id)
     duration = segments[-1].end if segments else None
     with override_openai_key_for_request(x_openai_key):
-        items = chapters_from_segments(segments)
-    # Clamp chapter starts to valid range [0, duration]
-    clamped: list[tuple[str, float]] = []
-    for t, s in items:
-        try:
-            s_float = float(s)
-        except Exception:
-            continue
-        if s_float < 0:
-            s_float = 0.0
-        if duration is not None and s_float > duration:
-            s_float = max(0.0, float(duration))
-        clamped.append((t, s_float))
-    return ChaptersResponse(
-        video_id=video_id,
-        chapters=[ChapterItem(title=t, start=s) for t, s in clamped],
-    )
+        items = await chapters_from_segments(segments)
+    return ChaptersResponse.model_construct(video_id=video_id, chapters=_clamp_chapters(items, duration))
 
 
 @router.get("/takeaways/{video_id}", response_model=TakeawaysResponse, dependencies=[Depends(guard_request)])
 async def get_takeaways(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> TakeawaysResponse:
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, source, lang = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        return TakeawaysResponse(video_id=video_id, takeaways=ai_takeaways(text))
+        return TakeawaysResponse.model_construct(video_id=video_id, takeaways=await ai_takeaways(text))
+
+
+@router.get("/insights/{video_id}", response_model=InsightsResponse, dependencies=[Depends(guard_request)])
+async def get_insights(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> InsightsResponse:
+    """Summary, chapters, takeaways and entities in one round-trip.
+
+    All four come from a single bundled OpenAI request when it parses; any field that
+    doesn't falls back to its own call, and those run concurrently.
+    """
+    segments, text, _, _ = await _load_transcript(video_id)
+    duration = segments[-1].end if segments else None
+    with override_openai_key_for_request(x_openai_key):
+        with use_ai_bundle(await ai_bundle(segments)):
+            summary, items, takes, ents = await asyncio.gather(
+                summarize(text),
+                chapters_from_segments(segments),
+                ai_takeaways(text),
+                ai_entities(text),
+            )
+    return InsightsResponse.model_construct(
+        video_id=video_id,
+        summary=summary,
+        chapters=_clamp_chapters(items, duration),
+        takeaways=takes,
+        entities=ents,
+    )
 
 
 @router.post("/qa", response_model=QAResponse, dependencies=[Depends(guard_request)])
 async def post_qa(req: QARequest, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> QAResponse:
-    segments, _, _ = get_transcript_pipeline(req.video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(req.video_id)
     with override_openai_key_for_request(x_openai_key):
-        return QAResponse(video_id=req.video_id, question=req.question, answer=ai_answer(text, req.question))
+        return QAResponse.model_construct(video_id=req.video_id, question=req.question, answer=await ai_answer(text, req.question))
 
 
 @router.get("/entities/{video_id}", response_model=EntitiesResponse, dependencies=[Depends(guard_request)])
 async def get_entities(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> EntitiesResponse:
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, source, lang = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        return EntitiesResponse(video_id=video_id, entities=ai_entities(text))
+        return EntitiesResponse.model_construct(video_id=video_id, entities=await ai_entities(text))
+
+
+_EXPORT_CHUNK_PIECES = 256
+
+
+def _join_chunks(pieces: Iterable[str], sep: str) -> Iterator[str]:
+    """Yield sep.join(pieces) a few hundred pieces at a time."""
+    batch: list[str] = []
+    lead = ""
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) >= _EXPORT_CHUNK_PIECES:
+            yield lead + sep.join(batch)
+            lead, batch = sep, []
+    if batch or not lead:
+        yield lead + sep.join(batch)
+
+
+def _stream_export(pieces: Iterable[str], sep: str, filename: str) -> StreamingResponse:
+    # Stream long exports so the body is never held as one string and bytes start flowing early
+    return StreamingResponse(
+        _join_chunks(pieces, sep),
+        media_type="text/plain",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @router.get("/export/txt/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_txt(video_id: str):
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    body = segments_to_text(segments)
-    return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}.txt"})
+    _, text, _, _ = await _load_transcript(video_id)
+    # The joined text is cached with the transcript; nothing left to build or stream
+    return PlainTextResponse(content=text, headers={"Content-Disposition": f"attachment; filename={video_id}.txt"})
 
 
 def _format_timestamp(seconds: float) -> str:
@@ -123,183 +184,192 @@ def _format_timestamp(seconds: float) -> str:
     return f"{h:02}:{m:02}:{s:02}"
 
 
+def _clock_columns(values: np.ndarray, unit: int) -> tuple[list[int], list[int], list[int], list[int]]:
+    """Split times (already scaled to ``unit`` ticks per second, fractions truncated) into h, m, s and remainder columns."""
+    total = values.astype(np.int64)
+    secs, frac = np.divmod(total, unit)
+    h, rem = np.divmod(secs, 3600)
+    m, s = np.divmod(rem, 60)
+    return h.tolist(), m.tolist(), s.tolist(), frac.tolist()
+
+
+def _segment_bounds(segments: list[TranscriptSegment]) -> tuple[np.ndarray, np.ndarray]:
+    starts = np.fromiter((seg.start for seg in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter((seg.end for seg in segments), dtype=np.float64, count=len(segments))
+    return starts, ends
+
+
 @router.get("/export/srt/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_srt(video_id: str):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    lines = []
-    for i, seg in enumerate(segments, start=1):
-        # Convert seconds to SRT format HH:MM:SS,mmm
-        start_h = int(seg.start // 3600)
-        start_m = int((seg.start % 3600) // 60)
-        start_s = int(seg.start % 60)
-        start_ms = int((seg.start % 1) * 1000)
-
-        end_h = int(seg.end // 3600)
-        end_m = int((seg.end % 3600) // 60)
-        end_s = int(seg.end % 60)
-        end_ms = int((seg.end % 1) * 1000)
-
-        lines.append(str(i))
-        lines.append(f"{start_h:02d}:{start_m:02d}:{start_s:02d},{start_ms:03d} --> {end_h:02d}:{end_m:02d}:{end_s:02d},{end_ms:03d}")
-        lines.append(seg.text)
-        lines.append("")
-    body = "\n".join(lines)
-    return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}.srt"})
+    segments, _, _, _ = await _load_transcript(video_id)
+    starts, ends = _segment_bounds(segments)
+    # SRT timestamps are HH:MM:SS,mmm; work in integer milliseconds, rounded so 2.01s isn't ,009
+    sh, sm, ss, sms = _clock_columns(np.rint(starts * 1000), 1000)
+    eh, em, es, ems = _clock_columns(np.rint(ends * 1000), 1000)
+    blocks = (
+        f"{k + 1}\n{sh[k]:02d}:{sm[k]:02d}:{ss[k]:02d},{sms[k]:03d} --> {eh[k]:02d}:{em[k]:02d}:{es[k]:02d},{ems[k]:03d}\n{seg.text}\n"
+        for k, seg in enumerate(segments)
+    )
+    return _stream_export(blocks, "\n", f"{video_id}.srt")
 
 
 @router.get("/export/vtt/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_vtt(video_id: str):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    lines = ["WEBVTT", ""]
-    for seg in segments:
-        sh = _format_timestamp(seg.start)
-        eh = _format_timestamp(seg.end)
-        lines.append(f"{sh}.000 --> {eh}.000")
-        lines.append(seg.text)
-        lines.append("")
-    body = "\n".join(lines)
-    return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}.vtt"})
+    segments, _, _, _ = await _load_transcript(video_id)
+    starts, ends = _segment_bounds(segments)
+    sh, sm, ss, _ = _clock_columns(starts, 1)
+    eh, em, es, _ = _clock_columns(ends, 1)
+    cues = (
+        f"{sh[k]:02}:{sm[k]:02}:{ss[k]:02}.000 --> {eh[k]:02}:{em[k]:02}:{es[k]:02}.000\n{seg.text}\n"
+        for k, seg in enumerate(segments)
+    )
+    return _stream_export(itertools.chain(["WEBVTT", ""], cues), "\n", f"{video_id}.vtt")
 
 
 @router.get("/export/chapters/{video_id}", dependencies=[Depends(guard_request)])
 async def export_chapters(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, _, _, _ = await _load_transcript(video_id)
     duration = segments[-1].end if segments else None
     with override_openai_key_for_request(x_openai_key):
-        items = chapters_from_segments(segments)
+        items = await chapters_from_segments(segments)
     payload = {"video_id": video_id, "chapters": [{"title": t, "start": s} for t, s in items]}
-    return JSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-chapters.json"})
+    return ORJSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-chapters.json"})
 
 
 @router.get("/entities/by-type/{video_id}", dependencies=[Depends(guard_request)])
 async def get_entities_by_type(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, source, lang = await _load_transcript(video_id)
     # Try AI categorization if available
     from app.services.ai import entities as ai_entities
     from app.services.ai import entities_by_type as ai_entities_by_type  # type: ignore
+    from app.services.ai import bucket_entities
     try:
         with override_openai_key_for_request(x_openai_key):
-            cats = ai_entities_by_type(text)
+            cats = await ai_entities_by_type(text)
     except Exception:
-        # Fallback: flat -> simple heuristic categorization
-        flat = ai_entities(text)
-        people: list[str] = []
-        orgs: list[str] = []
-        products: list[str] = []
-        org_keywords = [
-            "inc", "llc", "ltd", "corp", "company", "network", "studios", "pictures", "discovery",
-            "netflix", "disney", "hbo", "warner", "paramount", "cartoon network"
-        ]
-        for e in flat:
-            lower = e.lower()
-            if any(k in lower for k in org_keywords):
-                if e not in orgs:
-                    orgs.append(e)
-            elif " " in e and all(part and part[0].isupper() for part in e.split()[:2]):
-                if e not in people:
-                    people.append(e)
-            else:
-                if e not in products:
-                    products.append(e)
-        cats = {"people": people, "organizations": orgs, "products": products}
-    return {"video_id": video_id, **cats}
-
+        # Fallback: flat -> the same heuristic categorization entities_by_type uses
+        cats = bucket_entities(await ai_entities(text))
+    return ORJSONResponse(content={"video_id": video_id, **cats})
 
 
 @router.post("/chat", response_model=ChatResponse, dependencies=[Depends(guard_request)])
 async def post_chat(req: ChatRequest, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> ChatResponse:
-    segments, _, _ = get_transcript_pipeline(req.video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(req.video_id)
     with override_openai_key_for_request(x_openai_key):
-        out = grounded_chat(text, [m.dict() for m in req.messages])
+        out = await grounded_chat(text, [m.dict() for m in req.messages])
     from app.models.schemas import ChatMessage
     return ChatResponse(video_id=req.video_id, message=ChatMessage(role="assistant", content=out))
 
+
+_BATCH_CONCURRENCY = 16
+_SLASHES_RE = re.compile(r"/{2,}")
+
+
+def _batch_target(url: str, batch_path: str) -> str | None:
+    """Canonical in-app path for a batch sub-request, or None if it isn't an allowed /api/ url.
+
+    The path is percent-decoded and has duplicate slashes and dot segments collapsed before it is
+    checked, so encoded or dotted spellings of the batch endpoint can't recurse into it.
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    path = parts.path
+    while (decoded := unquote(path)) != path:
+        path = decoded
+    path = posixpath.normpath(_SLASHES_RE.sub("/", path))
+    if not path.startswith("/api/") or path == batch_path:
+        return None
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+@router.post("/batch", response_model=BatchResponse, dependencies=[Depends(guard_request)])
+async def post_batch(req: BatchRequest, request: Request, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")) -> BatchResponse:
+    """Run several API calls in one round-trip. Sub-requests go through the app (and its rate limits) in-process."""
+    client_ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown")
+    headers = {"x-forwarded-for": client_ip}
+    if x_openai_key:
+        headers["X-OpenAI-Key"] = x_openai_key
+    sem = asyncio.Semaphore(_BATCH_CONCURRENCY)
+    batch_path = request.app.url_path_for("post_batch")
+
+    async def dispatch(client: httpx.AsyncClient, item: BatchRequestItem) -> BatchResponseItem:
+        target = _batch_target(item.url, batch_path)
+        if target is None:
+            return BatchResponseItem.model_construct(id=item.id, status=400, body={"detail": "Unsupported batch url"})
+        async with sem:
+            try:
+                resp = await client.request(item.method.upper(), target, json=item.body, headers=headers)
+            except Exception as exc:  # noqa: BLE001
+                return BatchResponseItem.model_construct(id=item.id, status=500, body={"detail": str(exc)})
+        try:
+            body = resp.json()
+        except ValueError:
+            body = resp.text
+        return BatchResponseItem.model_construct(id=item.id, status=resp.status_code, body=body)
+
+    transport = httpx.ASGITransport(app=request.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+        responses = await asyncio.gather(*[dispatch(client, item) for item in req.requests])
+    return BatchResponse.model_construct(responses=list(responses))
+
+
 # ========= Extended export endpoints =========
 
 @router.get("/export/transcript/json/{video_id}", dependencies=[Depends(guard_request)])
 async def export_transcript_json(video_id: str):
-    segments, source, lang = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
+    segments, text, source, lang = await _load_transcript(video_id)
     payload = {
         "video_id": video_id,
         "source": source,
         "language": lang,
-        "segments": [s.dict() for s in segments],
-        "text": segments_to_text(segments),
+        "segments": [s.model_dump() for s in segments],
+        "text": text,
     }
-    return JSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-transcript.json"})
+    return ORJSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-transcript.json"})
 
 
 @router.get("/export/summary/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_summary(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        body = summarize(text)
+        body = await summarize(text)
     return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}-summary.txt"})
 
 
 @router.get("/export/takeaways/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_takeaways(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        items = ai_takeaways(text)
+        items = await ai_takeaways(text)
     body = "\n".join(items)
     return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}-takeaways.txt"})
 
 
 @router.get("/export/entities/txt/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_entities_txt(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        items = ai_entities(text)
+        items = await ai_entities(text)
     body = "\n".join(items)
     return PlainTextResponse(content=body, headers={"Content-Disposition": f"attachment; filename={video_id}-entities.txt"})
 
 
 @router.get("/export/entities/json/{video_id}", dependencies=[Depends(guard_request)])
 async def export_entities_json(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     with override_openai_key_for_request(x_openai_key):
-        items = ai_entities(text)
+        items = await ai_entities(text)
     payload = {"video_id": video_id, "entities": items}
-    return JSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-entities.json"})
+    return ORJSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename={video_id}-entities.json"})
 
 
 @router.get("/export/chapters/md/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_chapters_md(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     duration = segments[-1].end if segments else None
     with override_openai_key_for_request(x_openai_key):
-        items = ai_chapters(text, duration)
+        items = await ai_chapters(text, duration)
     lines = ["# Chapters"]
     for t, s in items:
         try:
@@ -313,16 +383,13 @@ async def export_chapters_md(video_id: str, x_openai_key: str | None = Header(de
 
 @router.get("/export/full/md/{video_id}", response_class=PlainTextResponse, dependencies=[Depends(guard_request)])
 async def export_full_md(video_id: str, x_openai_key: str | None = Header(default=None, alias="X-OpenAI-Key")):
-    segments, _, _ = get_transcript_pipeline(video_id)
-    if not segments:
-        raise HTTPException(status_code=404, detail="Transcript not available")
-    text = segments_to_text(segments)
+    segments, text, _, _ = await _load_transcript(video_id)
     duration = segments[-1].end if segments else None
     with override_openai_key_for_request(x_openai_key):
-        sm = summarize(text)
-        ch = ai_chapters(text, duration)
-        tk = ai_takeaways(text)
-        en = ai_entities(text)
+        sm = await summarize(text)
+        ch = await ai_chapters(text, duration)
+        tk = await ai_takeaways(text)
+        en = await ai_entities(text)
     md_lines: list[str] = []
     md_lines.append(f"# Video {video_id}")
     md_lines.append("")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+DEFAULT_TTL_SECONDS = 60 * 60 * 24  # 1 day
+
+# Set while a cached() call is running once its result must not be stored; see mark_uncacheable()
+_uncacheable: contextvars.ContextVar[bool] = contextvars.ContextVar("uncacheable", default=False)
+
+try:
+    import msgspec  # type: ignore
+
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+    _msgpack_decoder = msgspec.msgpack.Decoder()
+except Exception:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cached value; MessagePack via msgspec when installed, else JSON."""
+    if msgspec is not None:
+        return _msgpack_encoder.encode(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes | str) -> Any:
+    if msgspec is not None and isinstance(raw, bytes):
+        try:
+            return _msgpack_decoder.decode(raw)
+        except Exception:
+            pass  # entry written as JSON (e.g. before msgspec was installed)
+    return json.loads(raw)
+
+
+class InMemoryCache:
+    """Per-process TTL cache with LRU eviction.
+
+    Each worker keeps its own copy; set REDIS_URL to share entries between workers.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self.entries.pop(key, None)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> None:
+        self.entries[key] = (value, time.time() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class RedisCache:
+    """Redis-backed cache shared by all workers.
+
+    Values are stored as MessagePack when msgspec is installed (smaller and faster
+    to encode/decode than JSON), otherwise as JSON.
+
+    Redis errors are treated as cache misses so an outage never fails a request.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # type: ignore
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._client.get(key)
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        try:
+            return _loads(raw)
+        except Exception:
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> None:
+        try:
+            await self._client.set(key, _dumps(value), ex=ttl)
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        # Shared entries are left alone; they expire on their own TTL
+        pass
+
+
+def _build_cache() -> InMemoryCache | RedisCache:
+    url = os.environ.get("REDIS_URL")
+    if url:
+        try:
+            return RedisCache(url)
+        except Exception:
+            pass
+    return InMemoryCache(max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024")))
+
+
+cache = _build_cache()
+
+
+def make_key(fn: str, model: str, text: str, extra: str = "") -> str:
+    text_hash = hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+    raw = f"{fn}:{model}:{text_hash}:{extra}"
+    return hashlib.blake2b(raw.encode("utf-8", errors="ignore"), digest_size=16).hexdigest()
+
+
+def mark_uncacheable() -> None:
+    """Keep the result of the cached() call in progress (and of any cached() call awaiting it) out of the cache.
+
+    For degraded results, e.g. a fallback returned because the model call failed, which
+    would otherwise be served for the whole TTL under the key of a real answer.
+    """
+    _uncacheable.set(True)
+
+
+def cached(
+    key_fn: Callable[..., str],
+    ttl: int = DEFAULT_TTL_SECONDS,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Cache an async function's result under the key returned by key_fn(*args, **kwargs).
+
+    Results the function flags with mark_uncacheable() are returned but not stored.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = key_fn(*args, **kwargs)
+            hit = await cache.get(key)
+            if hit is not None:
+                return hit
+            token = _uncacheable.set(False)
+            try:
+                result = await fn(*args, **kwargs)
+                uncacheable = _uncacheable.get()
+            finally:
+                _uncacheable.reset(token)
+            if uncacheable:
+                # A caller building on this result is degraded too
+                mark_uncacheable()
+                return result
+            await cache.set(key, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
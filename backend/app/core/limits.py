@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import inspect
+import os
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Tuple
 
 from fastapi import Request, HTTPException
 
@@ -10,13 +13,21 @@ class InMemoryRateLimiter:
     """Simple per-IP sliding window rate limiter and quota.
 
     Not for multi-instance production, but good enough to guard abuse.
+    At most max_tracked_ips clients are remembered; the least recently seen are dropped first.
     """
 
-    def __init__(self, max_requests_per_minute: int = 30, daily_quota: int = 200):
+    def __init__(self, max_requests_per_minute: int = 30, daily_quota: int = 200, max_tracked_ips: int = 100_000):
         self.max_requests_per_minute = max_requests_per_minute
         self.daily_quota = daily_quota
-        self.minute_buckets: Dict[str, Tuple[int, float]] = {}
-        self.daily_counts: Dict[str, Tuple[int, int]] = {}
+        self.max_tracked_ips = max_tracked_ips
+        self.minute_buckets: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self.daily_counts: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+
+    def _store(self, table: OrderedDict, ip: str, value: tuple) -> None:
+        table[ip] = value
+        table.move_to_end(ip)
+        if len(table) > self.max_tracked_ips:
+            table.popitem(last=False)
 
     def check(self, ip: str) -> None:
         now = time.time()
@@ -26,7 +37,7 @@ class InMemoryRateLimiter:
             count = 0
             ts = now
         count += 1
-        self.minute_buckets[ip] = (count, ts)
+        self._store(self.minute_buckets, ip, (count, ts))
         if count > self.max_requests_per_minute:
             raise HTTPException(status_code=429, detail="Too many requests")
 
@@ -37,16 +48,61 @@ class InMemoryRateLimiter:
             dcount = 0
             dday = day
         dcount += 1
-        self.daily_counts[ip] = (dcount, dday)
+        self._store(self.daily_counts, ip, (dcount, dday))
         if dcount > self.daily_quota:
             raise HTTPException(status_code=429, detail="Daily quota exceeded")
 
 
-limiter = InMemoryRateLimiter(max_requests_per_minute=20, daily_quota=150)
+class RedisRateLimiter:
+    """Per-IP minute window and daily quota kept in Redis so every worker shares the same counts.
 
+    Counters are plain INCR keys that expire with their window. If Redis is unreachable
+    the check falls back to a per-process InMemoryRateLimiter.
+    """
 
-async def guard_request(request: Request) -> None:
-    client_ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown")
-    limiter.check(client_ip)
+    def __init__(self, url: str, max_requests_per_minute: int = 30, daily_quota: int = 200):
+        import redis.asyncio as redis  # type: ignore
 
+        self._client = redis.from_url(url)
+        self.max_requests_per_minute = max_requests_per_minute
+        self.daily_quota = daily_quota
+        self._fallback = InMemoryRateLimiter(max_requests_per_minute, daily_quota)
 
+    async def check(self, ip: str) -> None:
+        now = time.time()
+        minute_key = f"rl:min:{ip}:{int(now // 60)}"
+        day_key = f"rl:day:{ip}:{int(now // 86400)}"
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.incr(minute_key)
+            pipe.expire(minute_key, 60)
+            pipe.incr(day_key)
+            pipe.expire(day_key, 86400)
+            count, _, dcount, _ = await pipe.execute()
+        except Exception:
+            self._fallback.check(ip)
+            return
+        if count > self.max_requests_per_minute:
+            raise HTTPException(status_code=429, detail="Too many requests")
+        if dcount > self.daily_quota:
+            raise HTTPException(status_code=429, detail="Daily quota exceeded")
+
+
+def _build_limiter(max_requests_per_minute: int, daily_quota: int) -> InMemoryRateLimiter | RedisRateLimiter:
+    url = os.environ.get("REDIS_URL")
+    if url:
+        try:
+            return RedisRateLimiter(url, max_requests_per_minute, daily_quota)
+        except Exception:
+            pass
+    return InMemoryRateLimiter(max_requests_per_minute=max_requests_per_minute, daily_quota=daily_quota)
+
+
+limiter = _build_limiter(max_requests_per_minute=20, daily_quota=150)
+
+
+async def guard_request(request: Request) -> None:
+    client_ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown")
+    result = limiter.check(client_ip)
+    if inspect.isawaitable(result):
+        await result
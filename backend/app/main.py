@@ -1,3 +1,7 @@
+import os
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -8,9 +12,31 @@ load_dotenv()
 
 from app.api.routes import router as api_router
 from app.core.limits import guard_request
+from app.services.ai import close_openai_http_client
+from app.services.transcript import extract_youtube_id
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bound the worker threads used for blocking transcript work
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.environ.get("THREADPOOL_SIZE", "16"))
+    try:
+        yield
+    finally:
+        await close_openai_http_client()
 
 
-app = FastAPI(title="yt-ai", version="0.1.0")
+_TEST_MODE = os.environ.get("APP_ENV") == "test"
+
+app = FastAPI(
+    title="yt-ai",
+    version="0.1.0",
+    lifespan=lifespan,
+    # Tests never hit the schema or docs UIs; skip registering them
+    openapi_url=None if _TEST_MODE else "/openapi.json",
+    docs_url=None if _TEST_MODE else "/docs",
+    redoc_url=None if _TEST_MODE else "/redoc",
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,28 +64,6 @@ class ParseResponse(BaseModel):
     video_id: str
 
 
-def extract_youtube_id(url: str) -> str:
-    # Handles youtube.com/watch?v=, youtu.be/, shorts/, embed/
-    import re
-
-    patterns = [
-        r"(?:v=|v%3D)([a-zA-Z0-9_-]{11})",  # watch URLs and encoded
-        r"youtu\.be/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/shorts/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/embed/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/live/([a-zA-Z0-9_-]{11})",
-    ]
-    for pattern in patterns:
-        m = re.search(pattern, url)
-        if m:
-            return m.group(1)
-    # As a last resort, capture a 11-char token
-    m = re.search(r"([a-zA-Z0-9_-]{11})", url)
-    if m:
-        return m.group(1)
-    raise ValueError("Could not parse YouTube video id")
-
-
 @app.post("/parse", response_model=ParseResponse, dependencies=[Depends(guard_request)])
 async def parse(req: ParseRequest) -> ParseResponse:
     try:
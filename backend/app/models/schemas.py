@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -47,6 +47,14 @@ class TakeawaysResponse(BaseModel):
     takeaways: List[str]
 
 
+class InsightsResponse(BaseModel):
+    video_id: str
+    summary: str
+    chapters: List[ChapterItem]
+    takeaways: List[str]
+    entities: List[str]
+
+
 class QARequest(BaseModel):
     video_id: str
     question: str
@@ -81,3 +89,24 @@ class ChatResponse(BaseModel):
     video_id: str
     message: ChatMessage
 
+
+# Batch models
+class BatchRequestItem(BaseModel):
+    id: str
+    url: str = Field(..., description="API path relative to the server root, e.g. /api/summary/{video_id}")
+    method: str = "GET"
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., max_length=50)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import contextvars
 import re
@@ -8,22 +9,114 @@ import json
 import hashlib
 from typing import Callable, Any
 import time
-import math
-import collections
+import functools
+import random
+from typing import TYPE_CHECKING
 
-import yake
+import numpy as np
+import orjson
+
+try:
+    import re2  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    re2 = None
+
+try:
+    from langdetect import detect as _langdetect  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _langdetect = None
+
+from app.core.cache import cached, make_key, mark_uncacheable
+
+if TYPE_CHECKING:
+    import yake
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 _override_openai_key: contextvars.ContextVar[str | None] = contextvars.ContextVar("override_openai_key", default=None)
-
-_openai_client = None
-if OPENAI_API_KEY:
+# Parsed ai_bundle() reply for the current request; see use_ai_bundle()
+_ai_bundle_result: contextvars.ContextVar[dict | None] = contextvars.ContextVar("ai_bundle_result", default=None)
+
+_http_client = None
+_openai_client = None  # created on first use; see _default_openai_client()
+
+_WS_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+_SENT_END_RE = re.compile(r"[.!?]+")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_TRAIL_PUNCT_RE = re.compile(r"[\s\-–—]*[\.;:!,]+$")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
+# A JSON string (closing quote optional, so an unterminated string runs to the end) or a brace
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}]', re.S)
+# Hot path of the offline entity fallback on long transcripts. RE2 (google-re2) matches in
+# linear time without backtracking; note its \b is ASCII-only.
+_PROPER_NOUN_RE = (re2 or re).compile(r"\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,3})\b")
+
+
+def _http2_available() -> bool:
     try:
-        from openai import OpenAI  # type: ignore
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
-        _openai_client = OpenAI(api_key=OPENAI_API_KEY)
-    except Exception:
-        _openai_client = None
+
+def _shared_http_client():
+    """Pooled async HTTP client shared by every OpenAI client in this process.
+
+    Override-key clients reuse it as well, so TLS handshakes are paid once per pooled
+    connection. With h2 installed, concurrent calls are multiplexed over HTTP/2.
+    """
+    global _http_client
+    if _http_client is None:
+        import httpx
+        from openai import DefaultAsyncHttpxClient  # type: ignore
+
+        _http_client = DefaultAsyncHttpxClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(max_connections=500, max_keepalive_connections=200),
+        )
+    return _http_client
+
+
+async def close_openai_http_client() -> None:
+    """Close the pooled connections (app shutdown); clients are rebuilt on next use."""
+    global _http_client, _openai_client
+    client, _http_client, _openai_client = _http_client, None, None
+    _client_for.cache_clear()
+    if client is not None:
+        await client.aclose()
+
+
+def _default_openai_client():
+    """Client for the server's own key, built on first use so workers that never call OpenAI skip the import."""
+    global _openai_client
+    if _openai_client is None and OPENAI_API_KEY:
+        try:
+            from openai import AsyncOpenAI  # type: ignore
+
+            _openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=_shared_http_client())
+        except Exception:
+            return None
+    return _openai_client
+
+
+# Global cap on in-flight OpenAI calls so bursts don't turn into 429 storms
+_openai_semaphore = asyncio.Semaphore(int(os.environ.get("OPENAI_MAX_CONCURRENCY", "32")))
+_OPENAI_MAX_ATTEMPTS = 4
+
+
+async def _create_completion(client: Any, kwargs: dict[str, Any]) -> Any:
+    """One chat completion under the concurrency cap, retried with jittered backoff on rate limits."""
+    from openai import RateLimitError  # type: ignore
+
+    async with _openai_semaphore:
+        for attempt in range(_OPENAI_MAX_ATTEMPTS):
+            try:
+                return await client.chat.completions.create(**kwargs)
+            except RateLimitError:
+                if attempt == _OPENAI_MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(random.uniform(0, min(60.0, 2.0 ** (attempt + 1))))
 
 
 def _effective_openai_key() -> Optional[str]:
@@ -31,6 +124,32 @@ def _effective_openai_key() -> Optional[str]:
     return override or OPENAI_API_KEY
 
 
+def _fallback_result() -> None:
+    """Mark a heuristic fallback as uncacheable when a model answer was expected.
+
+    Without a key the fallback is the answer and is cached under the "fallback" model (see
+    _ai_cache_key); with one, a failed or unusable call must not pin it for the cache TTL.
+    """
+    if _effective_openai_key():
+        mark_uncacheable()
+
+
+def _openai_client_for_request():
+    """Return the shared client, or a client bound to the per-request override key."""
+    override = _override_openai_key.get()
+    if not override:
+        return _default_openai_client()
+    return _client_for(override)
+
+
+@functools.lru_cache(maxsize=8)
+def _client_for(key: str):
+    """Client bound to an override key; reused across requests and sharing the pooled connections."""
+    from openai import AsyncOpenAI  # type: ignore
+
+    return AsyncOpenAI(api_key=key, http_client=_shared_http_client())
+
+
 def _log_ai_event(event: str, details: dict[str, Any]) -> None:
     """Lightweight logging controlled by env LOG_AI=1."""
     try:
@@ -42,7 +161,37 @@ def _log_ai_event(event: str, details: dict[str, Any]) -> None:
         pass
 
 
-def _call_openai(
+def _log_openai_call(model: str, system: str, prompt: str, out: Optional[str], resp: Any, latency_ms: int) -> None:
+    try:
+        finish_reason = getattr(resp.choices[0], "finish_reason", None)
+    except Exception:
+        finish_reason = None
+    # Check if any reasoning-like field exists without logging content
+    reasoning_present = False
+    try:
+        ch0 = resp.choices[0]
+        reasoning_present = bool(
+            getattr(getattr(ch0, "message", object()), "reasoning", None)
+            or getattr(ch0, "logprobs", None)
+        )
+    except Exception:
+        reasoning_present = False
+    prompt_raw = (system + "\n" + prompt).encode("utf-8", errors="ignore")
+    _log_ai_event(
+        "openai_call",
+        {
+            "model": model,
+            "prompt_bytes": len(prompt_raw) - 1,
+            "response_bytes": len((out or "").encode("utf-8", errors="ignore")),
+            "latency_ms": latency_ms,
+            "finish_reason": finish_reason,
+            "prompt_hash": hashlib.sha256(prompt_raw).hexdigest(),
+            "reasoning_present": reasoning_present,
+        },
+    )
+
+
+async def _call_openai(
     prompt: str,
     system: str = "You are a helpful assistant.",
     *,
@@ -53,17 +202,11 @@ def _call_openai(
     top_p: float = 0.0,
     response_format: Optional[dict[str, Any]] = None,
 ) -> Optional[str]:
-    key = _effective_openai_key()
-    if not key:
-        return None
     try:
-        # Create a short-lived client with the effective key to avoid cross-request leakage
-        from openai import OpenAI  # type: ignore
-        client = OpenAI(api_key=key)
+        client = _openai_client_for_request()
+        if client is None:
+            return None
         model = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
-        prompt_bytes = len(prompt.encode("utf-8", errors="ignore"))
-        system_bytes = len(system.encode("utf-8", errors="ignore"))
-        prompt_hash = hashlib.sha256((system + "\n" + prompt).encode("utf-8", errors="ignore")).hexdigest()
         t0 = time.time()
         kwargs: dict[str, Any] = {
             "model": model,
@@ -79,41 +222,35 @@ def _call_openai(
         }
         if response_format is not None:
             kwargs["response_format"] = response_format
-        resp = client.chat.completions.create(**kwargs)
+        resp = await _create_completion(client, kwargs)
         out = resp.choices[0].message.content  # type: ignore[assignment]
-        try:
-            finish_reason = getattr(resp.choices[0], "finish_reason", None)
-        except Exception:
-            finish_reason = None
-        # Check if any reasoning-like field exists without logging content
-        reasoning_present = False
-        try:
-            ch0 = resp.choices[0]
-            reasoning_present = bool(
-                getattr(getattr(ch0, "message", object()), "reasoning", None)
-                or getattr(ch0, "logprobs", None)
-            )
-        except Exception:
-            reasoning_present = False
-        dt = int((time.time() - t0) * 1000)
-        response_bytes = len((out or "").encode("utf-8", errors="ignore"))
-        _log_ai_event(
-            "openai_call",
-            {
-                "model": model,
-                "prompt_bytes": prompt_bytes + system_bytes,
-                "response_bytes": response_bytes,
-                "latency_ms": dt,
-                "finish_reason": finish_reason,
-                "prompt_hash": prompt_hash,
-                "reasoning_present": reasoning_present,
-            },
-        )
+        if os.environ.get("LOG_AI") == "1":
+            # Byte counts and the prompt hash are only needed for the log line
+            _log_openai_call(model, system, prompt, out, resp, int((time.time() - t0) * 1000))
         return out  # type: ignore[return-value]
     except Exception:
         return None
 
 
+async def _call_openai_retry(
+    prompt: str,
+    *,
+    system: str,
+    attempts: int = 2,
+    backoff: float = 0.5,
+    **kw: Any,
+) -> Optional[str]:
+    """Call OpenAI (JSON object output unless overridden), retrying empty replies with exponential backoff."""
+    kw.setdefault("response_format", {"type": "json_object"})
+    for i in range(attempts):
+        out = await _call_openai(prompt, system=system, **kw)
+        if out:
+            return out
+        if i + 1 < attempts:
+            await asyncio.sleep(backoff * (2 ** i))
+    return None
+
+
 def override_openai_key_for_request(key: Optional[str]):
     """Context manager to apply per-request OpenAI key override safely."""
     import contextlib
@@ -129,31 +266,103 @@ def override_openai_key_for_request(key: Optional[str]):
     return _ctx()
 
 
+def use_ai_bundle(bundle: Optional[dict]):
+    """Context manager making an ai_bundle() result visible to summarize/chapters/takeaways/entities.
+
+    Each function takes its field from the bundle when it passes the usual validation and
+    otherwise makes its own call, so a missing or partial bundle changes nothing.
+    """
+    import contextlib
+
+    @contextlib.contextmanager
+    def _ctx():
+        token = _ai_bundle_result.set(bundle)
+        try:
+            yield
+        finally:
+            _ai_bundle_result.reset(token)
+
+    return _ctx()
+
+
+def _ai_cache_key(fn_name: str) -> Callable[..., str]:
+    """Cache-key builder for AI helpers whose first argument is the transcript (text or segments)."""
+
+    def key_fn(source: Any, *args: Any, **kwargs: Any) -> str:
+        if isinstance(source, str):
+            text = source
+        else:
+            text = "\n".join(
+                f"{getattr(s, 'start', '')}|{getattr(s, 'end', '')}|{getattr(s, 'text', '')}" for s in source
+            )
+        # Fallback (no key) results must not be served to callers that do have a key
+        model = os.environ.get("OPENAI_MODEL", "gpt-4o-mini") if _effective_openai_key() else "fallback"
+        extra = json.dumps([args, sorted(kwargs.items())], ensure_ascii=False, default=str)
+        return make_key(fn_name, model, text, extra)
+
+    return key_fn
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoding(model_hint: str):
+    """tiktoken encoding for model_hint, loaded once; None if tiktoken isn't installed."""
+    try:
+        import tiktoken  # type: ignore
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_hint)
+    except Exception:
+        return tiktoken.get_encoding("cl100k_base")
+
+
 def _token_clip(text: str, max_tokens: int, model_hint: str = "gpt-4o-mini") -> str:
     """Clip text by tokens using tiktoken if available; fallback to rough char heuristic."""
     try:
-        import tiktoken  # type: ignore
-        try:
-            enc = tiktoken.encoding_for_model(model_hint)
-        except Exception:
-            enc = tiktoken.get_encoding("cl100k_base")
-        tokens = enc.encode(text)
-        if len(tokens) <= max_tokens:
-            return text
-        clipped = enc.decode(tokens[:max_tokens])
-        return clipped
+        enc = _get_encoding(model_hint)
+        if enc is not None:
+            tokens = enc.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return enc.decode(tokens[:max_tokens])
     except Exception:
-        # Rough heuristic ~4 chars per token
-        approx_chars = max_tokens * 4
-        return text[:approx_chars]
+        pass
+    # Rough heuristic ~4 chars per token
+    approx_chars = max_tokens * 4
+    return text[:approx_chars]
+
+
+@functools.lru_cache(maxsize=64)
+def _clip_transcript(text: str, max_tokens: int) -> str:
+    """_token_clip memoized per transcript; every chat turn re-clips the same immutable text."""
+    return _token_clip(text, max_tokens)
+
+
+_TIKTOKEN_THREADS = int(os.environ.get("TIKTOKEN_MAX_THREADS", "8"))
+
+
+def _token_counts(texts: List[str], model_hint: str = "gpt-4o-mini") -> Optional[List[int]]:
+    """Token count of each text from one batched encode (tiktoken threads it natively); None without tiktoken."""
+    try:
+        enc = _get_encoding(model_hint)
+        if enc is not None:
+            return [len(ids) for ids in enc.encode_batch(texts, num_threads=_TIKTOKEN_THREADS)]
+    except Exception:
+        pass
+    return None
+
+
+# Leading numbering/bullets, then surrounding quotes (each with whitespace). Two passes, so a
+# quoted title that starts with a number ("2024 Recap") keeps it.
+_TITLE_BULLET_CHARS = "•-–—0123456789. )( \t\r\n"
+_TITLE_QUOTE_CHARS = "\"'”’“‘ \t\r\n"
 
 
 def _sanitize_title(title: str, max_len: int = 60) -> str:
     # Remove numbering/bullets and collapse whitespace; strip trailing punctuation
-    t = title.strip().lstrip("•-–—0123456789. )(").strip()
-    t = t.strip("\"'”’“‘")
-    t = re.sub(r"\s+", " ", t)
-    t = re.sub(r"[\s\-–—]*[\.;:!,]+$", "", t).strip()
+    t = title.lstrip(_TITLE_BULLET_CHARS).strip(_TITLE_QUOTE_CHARS)
+    t = _WS_RE.sub(" ", t)
+    t = _TRAIL_PUNCT_RE.sub("", t).strip()
     if len(t) > max_len:
         t = t[:max_len].rstrip()
     return t
@@ -165,95 +374,140 @@ def _safe_json(s: str) -> Optional[dict]:
     Returns dict if successful, else None.
     """
     try:
-        parsed = json.loads(s)
+        parsed = orjson.loads(s)
         return parsed if isinstance(parsed, dict) else None
     except Exception:
         pass
-    # Balanced brace scan respecting strings/escapes
+    # Balanced brace scan respecting strings/escapes; the regex skips string bodies
+    # in C so only braces are visited here
     best_span: tuple[int, int] | None = None
-    in_str = False
-    escape = False
     depth = 0
     start_idx = -1
-    for i, ch in enumerate(s):
-        if in_str:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == '"':
-                in_str = False
-            continue
-        else:
-            if ch == '"':
-                in_str = True
-                continue
-            if ch == "{":
-                if depth == 0:
-                    start_idx = i
-                depth += 1
-            elif ch == "}":
-                if depth > 0:
-                    depth -= 1
-                    if depth == 0 and start_idx >= 0:
-                        # Candidate complete JSON object
-                        span = (start_idx, i + 1)
-                        if best_span is None or (span[1] - span[0]) > (best_span[1] - best_span[0]):
-                            best_span = span
+    for m in _JSON_TOKEN_RE.finditer(s):
+        ch = m.group()
+        if ch == "{":
+            if depth == 0:
+                start_idx = m.start()
+            depth += 1
+        elif ch == "}":
+            if depth > 0:
+                depth -= 1
+                if depth == 0 and start_idx >= 0:
+                    # Candidate complete JSON object
+                    span = (start_idx, m.end())
+                    if best_span is None or (span[1] - span[0]) > (best_span[1] - best_span[0]):
+                        best_span = span
     if best_span:
         chunk = s[best_span[0]:best_span[1]]
         try:
-            parsed2 = json.loads(chunk)
+            parsed2 = orjson.loads(chunk)
             return parsed2 if isinstance(parsed2, dict) else None
         except Exception:
             return None
     return None
 
 
-_YAKE_CACHE_CAP = 256
-_yake_cache: "collections.OrderedDict[str, List[tuple[str, float]]]" = collections.OrderedDict()
+def _json_str_list(ai: Optional[str | dict], key: str) -> Optional[List[str]]:
+    """Whitespace-normalized, non-empty strings under data[key] of a JSON reply (or parsed dict); None if unparsable."""
+    if not ai:
+        return None
+    data = ai if isinstance(ai, dict) else _safe_json(ai)
+    if data is None:
+        return None
+    try:
+        cleaned = (_WS_RE.sub(" ", str(x)).strip() for x in (data.get(key, []) or []))
+        return [x for x in cleaned if x]
+    except Exception:
+        return None
+
+
+def _chapter_items(ai: Optional[str | dict]) -> List[tuple[str, float]]:
+    # (title, start) pairs from a {"chapters": [...]} reply; any malformed entry discards the reply
+    if not ai:
+        return []
+    data = ai if isinstance(ai, dict) else _safe_json(ai)
+    if data is None:
+        return []
+    items: List[tuple[str, float]] = []
+    try:
+        for c in data.get("chapters", []) or []:
+            title = _sanitize_title(str(c.get("title", "")))
+            start = float(int(c.get("start", 0)))
+            if title:
+                items.append((title, start))
+    except Exception:
+        return []
+    return items
+
+
+# "the", "and" and "of" alone make up over a tenth of running English text and are rare
+# words in other Latin-script languages
+_ENGLISH_MARKERS = frozenset({"the", "and", "of"})
 
 
 def _detect_lang(text: str) -> str:
+    # Plain-ASCII text full of English function words is English; skip langdetect (slow, and
+    # pathologically so on some inputs) for it. Everything else is detected on the same sample.
+    sample = text[:4096]
+    if sample.isascii():
+        words = _WORD_RE.findall(sample.lower())
+        if words and sum(w in _ENGLISH_MARKERS for w in words) >= 0.05 * len(words):
+            return "en"
+    if _langdetect is None:
+        return "en"
     try:
-        from langdetect import detect  # type: ignore
-        return detect(text)
+        return _langdetect(sample)
     except Exception:
         return "en"
 
 
+@functools.lru_cache(maxsize=16)
+def _get_yake(lang: str, top: int, n: int, dedup: float, window: int) -> yake.KeywordExtractor:
+    # yake is slow to import and only needed by the offline fallbacks, so load it here.
+    # Building an extractor loads stopword lists; reuse one per configuration.
+    import yake
+
+    return yake.KeywordExtractor(
+        lan=lang,
+        top=top,
+        n=n,
+        stopwords=None,
+        dedupLim=dedup,
+        windowsSize=window,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _yake_extract(text: str, max_phrases: int, lang: Optional[str], window: int) -> tuple[tuple[str, float], ...]:
+    """Raw YAKE candidates, memoized per text and settings (language detection only runs on a miss)."""
+    # Up to 3-word phrases
+    kw = _get_yake(lang or _detect_lang(text), max_phrases * 2, 3, 0.7, window)
+    return tuple(kw.extract_keywords(text))
+
+
+_COMMON_SHORT_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our',
+    'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way',
+    'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use',
+})
+
+
 def extract_keyphrases(text: str, max_phrases: int = 12) -> List[str]:
-    # Cache by text hash and parameters
-    h = hashlib.sha256((text + f"|{max_phrases}").encode("utf-8", errors="ignore")).hexdigest()
-    if h in _yake_cache:
-        candidates = _yake_cache.pop(h)
-        _yake_cache[h] = candidates  # move to end (recent)
-    else:
-        lang = os.environ.get("YAKE_LANG") or _detect_lang(text)
-        window = int(os.environ.get("YAKE_WINDOW", "3"))
-        kw = yake.KeywordExtractor(
-            lan=lang,
-            top=max_phrases * 2,
-            n=3,  # Up to 3-word phrases
-            stopwords=None,
-            dedupLim=0.7,
-            windowsSize=max(3, min(4, window)),
-        )
-        candidates = kw.extract_keywords(text)
-        _yake_cache[h] = candidates
-        if len(_yake_cache) > _YAKE_CACHE_CAP:
-            _yake_cache.popitem(last=False)
+    window = int(os.environ.get("YAKE_WINDOW", "3"))
+    candidates = _yake_extract(text, max_phrases, os.environ.get("YAKE_LANG"), max(3, min(4, window)))
 
     # Filter and clean phrases
     cleaned = []
+    seen: set[str] = set()
     for phrase, score in candidates:
-        phrase = re.sub(r"\s+", " ", phrase).strip().strip("-•·•")
+        phrase = _WS_RE.sub(" ", phrase).strip().strip("-•·•")
         # Skip single common words and very short phrases
         if (len(phrase) > 3 and
-            phrase.lower() not in ['the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'] and
-            phrase not in cleaned and
-            len(phrase.split()) >= 2):  # Prefer multi-word phrases
+            phrase.lower() not in _COMMON_SHORT_WORDS and
+            phrase not in seen and
+            " " in phrase.strip()):  # Prefer multi-word phrases
             cleaned.append(phrase)
+            seen.add(phrase)
 
         if len(cleaned) >= max_phrases:
             break
@@ -261,31 +515,61 @@ def extract_keyphrases(text: str, max_phrases: int = 12) -> List[str]:
     return cleaned
 
 
-def summarize(text: str) -> str:
-    text_clip = _token_clip(text, max_tokens=3500)
+def _leading_sentences(text: str, limit: int) -> List[str]:
+    """First `limit` stripped sentences longer than 20 chars, without splitting the whole text."""
+    out: List[str] = []
+    pos = 0
+    for m in _SENT_END_RE.finditer(text):
+        sentence = text[pos:m.start()].strip()
+        pos = m.end()
+        if len(sentence) > 20:
+            out.append(sentence)
+            if len(out) >= limit:
+                return out
+    sentence = text[pos:].strip()
+    if len(sentence) > 20:
+        out.append(sentence)
+    return out
+
+
+def _summary_bullets(ai: Any) -> Optional[str]:
+    # 5..8 "- " bullets of 12..24 words from a model reply, else None
+    if isinstance(ai, list):
+        ai = "\n".join(str(x) for x in ai)
+    if not ai or not isinstance(ai, str):
+        return None
+    # Enforce bullet-only output by regex filtering
+    lines = [l for l in ai.splitlines() if l.strip().startswith("- ")]
+    # enforce word count bounds 12..24
+    lines = [l for l in lines if 12 <= len(_WORD_RE.findall(l)) <= 24]
+    if 5 <= len(lines) <= 8:
+        return "\n".join(lines[:8])
+    return None
+
+
+@cached(_ai_cache_key("summarize"))
+async def summarize(text: str) -> str:
+    bundled = _summary_bullets((_ai_bundle_result.get() or {}).get("summary"))
+    if bundled:
+        return bundled
+    text_clip = _clip_transcript(text, 3500)
     prompt = (
         "Summarize in 5–8 bullets, 12–22 words each. No sub-bullets, one bullet per line:\n" + text_clip
     )
-    ai = _call_openai(
+    ai = await _call_openai(
         prompt,
         system="Return ONLY bullets starting with '-' and a newline after EACH bullet. No other text.",
         max_tokens=500,
         presence_penalty=0.0,
         frequency_penalty=0.0,
     )
-    if ai:
-        # Enforce bullet-only output by regex filtering
-        lines = [l for l in ai.splitlines() if l.strip().startswith("- ")]
-        # enforce word count bounds 12..24
-        def wc(s: str) -> int:
-            return len([w for w in re.findall(r"\b\w+\b", s)])
-        lines = [l for l in lines if 12 <= wc(l) <= 24]
-        if 5 <= len(lines) <= 8:
-            return "\n".join(lines[:8])
-
-    # Better fallback: extract sentences and create summary
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+    bullets = _summary_bullets(ai)
+    if bullets:
+        return bullets
+
+    _fallback_result()
+    # Better fallback: extract sentences and create summary (only the first 20 are ever used)
+    sentences = _leading_sentences(text, 20)
 
     # Get key phrases for context
     key_phrases = extract_keyphrases(text, 6)
@@ -297,13 +581,14 @@ def summarize(text: str) -> str:
     if key_phrases:
         summary_parts.append(f"This video discusses {', '.join(key_phrases[:3]).lower()}")
 
-    # Find sentences that contain key phrases
+    # Find sentences that contain key phrases; lowercase each candidate sentence once
+    candidates = [(sentence.lower(), sentence) for sentence in sentences if len(sentence) < 150]
     important_sentences = []
     for phrase in key_phrases[:4]:
-        for sentence in sentences[:20]:  # Check first 20 sentences
-            if phrase.lower() in sentence.lower() and len(sentence) < 150:
-                important_sentences.append(sentence)
-                break
+        lp = phrase.lower()
+        hit = next((sentence for low, sentence in candidates if lp in low), None)
+        if hit is not None:
+            important_sentences.append(hit)
 
     # Add the most important sentences
     for sentence in important_sentences[:4]:
@@ -316,74 +601,30 @@ def summarize(text: str) -> str:
     return "\n".join(summary_parts) or text[:500]
 
 
-def chapters(text: str, duration: float | None = None) -> List[tuple[str, float]]:
-    text_clip = _token_clip(text, max_tokens=3500)
+@cached(_ai_cache_key("chapters"))
+async def chapters(text: str, duration: float | None = None) -> List[tuple[str, float]]:
+    text_clip = _clip_transcript(text, 3500)
     # Ask for JSON first
     system = 'Return ONLY JSON: {"chapters":[{"title":"...","start":0},...]}'
     user = '{"task":"chapters","rules":["strict","int_seconds"]}\nTranscript:\n' + text_clip
 
-    ai = None
-    for i in range(2):
-        ai = _call_openai(
-            user,
-            system=system,
-            max_tokens=600,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            top_p=0.0,
-            response_format={"type": "json_object"},
-        )
-        if ai:
-            break
-        time.sleep(0.5 * (2 ** i))
-    items: List[tuple[str, float]] = []
-    parse_ok = False
-    if ai:
-        data = _safe_json(ai)
-        if data is not None:
-            try:
-                for c in data.get("chapters", []) or []:
-                    title = _sanitize_title(str(c.get("title", "")))
-                    start = float(int(c.get("start", 0)))
-                    if title:
-                        items.append((title, start))
-                parse_ok = len(items) > 0
-            except Exception:
-                parse_ok = False
-    if not parse_ok:
+    items = _chapter_items(_ai_bundle_result.get())
+    if not items:
+        items = _chapter_items(await _call_openai_retry(user, system=system, max_tokens=600))
+    if not items:
         # Retry once with harsher system
-        ai2 = None
-        for i in range(2):
-            ai2 = _call_openai(
-                user,
-                system='Return ONLY JSON: {"chapters": []}. If format would be wrong, output exactly {"chapters": []}',
-                max_tokens=400,
-                presence_penalty=0.0,
-                frequency_penalty=0.0,
-                top_p=0.0,
-                response_format={"type": "json_object"},
-            )
-            if ai2:
-                break
-            time.sleep(0.5 * (2 ** i))
-        if ai2:
-            try:
-                data2 = _safe_json(ai2)
-                if data2 is not None:
-                    for c in data2.get("chapters", []) or []:
-                        title = _sanitize_title(str(c.get("title", "")))
-                        start = float(int(c.get("start", 0)))
-                        if title:
-                            items.append((title, start))
-                    parse_ok = len(items) > 0
-            except Exception:
-                parse_ok = False
+        items = _chapter_items(await _call_openai_retry(
+            user,
+            system='Return ONLY JSON: {"chapters": []}. If format would be wrong, output exactly {"chapters": []}',
+            max_tokens=400,
+        ))
     if items:
         # Filter out generic titles
         generic = {"introduction", "overview", "conclusion", "finale", "final thoughts", "summary"}
         items = [(t, s) for (t, s) in items if t.strip().lower() not in generic]
         return _postprocess_chapters(items, duration)
     # fallback: evenly spaced chapters titled by keyphrases
+    _fallback_result()
     num = 8
     if duration and duration > 0:
         interval = duration / num
@@ -394,9 +635,8 @@ def chapters(text: str, duration: float | None = None) -> List[tuple[str, float]
 
 
 def _format_ts_vtt(seconds: float) -> str:
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
     return f"{h:02d}:{m:02d}:{s:02d}.000"
 
 
@@ -446,15 +686,53 @@ def _postprocess_chapters(items: List[tuple[str, float]], duration: float | None
     return out[:10]
 
 
-def chapters_from_segments(segments: List[object], duration: float | None = None) -> List[tuple[str, float]]:
-    """Generate chapters using VTT built from segments so the model can align content to time.
+def _snap_chapter_items(chapters_json: list, allowed: np.ndarray, duration: float | None) -> List[tuple[str, float]]:
+    # Snap proposed starts to the nearest allowed cue second at or after them (past the end -> last one),
+    # then keep the chapters strictly increasing and unique
+    parsed: List[tuple[str, int]] = []
+    for c in chapters_json:
+        title = _sanitize_title(str(c.get("title", "")))
+        try:
+            sec_int = int(c.get("start", 0))
+        except Exception:
+            continue
+        parsed.append((title, sec_int))
+    if not parsed or allowed.size == 0:
+        return []
+    idx = np.searchsorted(allowed, [sec for _, sec in parsed], side="left")
+    snapped_all = allowed[np.minimum(idx, allowed.size - 1)].tolist()
 
-    Falls back to text-only chapters() if the AI parse fails.
-    """
+    items: List[tuple[str, float]] = []
+    used_seconds: set[int] = set()
+    last_start: int | None = None
+    for (title, _), snapped in zip(parsed, snapped_all):
+        if duration is not None and snapped >= int(duration):
+            continue
+        if last_start is not None and snapped <= last_start:
+            next_idx = int(np.searchsorted(allowed, last_start, side="right"))
+            if next_idx >= allowed.size:
+                continue
+            snapped = int(allowed[next_idx])
+        if snapped in used_seconds:
+            continue
+        items.append((title, float(snapped)))
+        used_seconds.add(snapped)
+        last_start = snapped
+        if len(items) >= 10:
+            break
+    return items
+
+
+# Transcript text sent with the chapters prompt: ~4k tokens, or ~16k chars without tiktoken
+_CHAPTER_CUE_TOKEN_BUDGET = 4000
+_CHAPTER_CUE_CHAR_BUDGET = 16000
+
+
+def _chapter_cues(segments: List[object]) -> tuple[str, np.ndarray]:
+    """Compact WEBVTT of the leading cues (within the prompt budget) and their sorted unique start seconds."""
     # Build compact VTT (truncate to avoid token limits)
-    vtt_lines: List[str] = ["WEBVTT", ""]
-    total = 0
-    cue_starts: List[float] = []
+    cues: List[tuple[float, float, str]] = []
+    chars = 0
     for seg in segments:
         try:
             start = float(getattr(seg, "start"))
@@ -464,23 +742,60 @@ def chapters_from_segments(segments: List[object], duration: float | None = None
             continue
         if not text:
             continue
-        vtt_lines.append(f"{_format_ts_vtt(start)} --> {_format_ts_vtt(end)}")
-        vtt_lines.append(text)
-        vtt_lines.append("")
-        cue_starts.append(start)
-        total += len(text)
-        if total > 16000:
+        cues.append((start, end, text))
+        chars += len(text)
+        if chars > 2 * _CHAPTER_CUE_CHAR_BUDGET:  # comfortably more than either budget can use
+            break
+    # Budget cue text by tokens (one batched encode) when tiktoken is available, else by chars
+    token_counts = _token_counts([text for _, _, text in cues])
+    if token_counts is not None:
+        sizes, budget = token_counts, _CHAPTER_CUE_TOKEN_BUDGET
+    else:
+        sizes, budget = [len(text) for _, _, text in cues], _CHAPTER_CUE_CHAR_BUDGET
+    vtt_lines: List[str] = ["WEBVTT", ""]
+    total = 0
+    cue_starts: List[float] = []
+    for (start, end, text), size in zip(cues, sizes):
+        # Stop before the cue that would overflow the budget (but always send at least one)
+        if cue_starts and total + size > budget:
             break
+        vtt_lines.append(f"{_format_ts_vtt(start)} --> {_format_ts_vtt(end)}\n{text}\n")
+        cue_starts.append(start)
+        total += size
     vtt_blob = "\n".join(vtt_lines)
 
-    # Prepare allowed (rounded) cue start seconds for post-validation/snap
-    import bisect
-    rounded_cue_starts = sorted({int(round(s)) for s in cue_starts if s >= 0})
-    if not rounded_cue_starts:
+    # Allowed (rounded) cue start seconds for post-validation/snap
+    starts_arr = np.asarray(cue_starts, dtype=np.float64)
+    # np.rint rounds half to even, same as round()
+    return vtt_blob, np.unique(np.rint(starts_arr[starts_arr >= 0]).astype(np.int64))
+
+
+def _prompt_cue_seconds(allowed: np.ndarray) -> List[int]:
+    # Downsample cue list if too large, keeping both boundaries
+    cue_seconds_full = allowed.tolist()
+    if len(cue_seconds_full) <= 3000:
+        return cue_seconds_full
+    n = max(2, len(cue_seconds_full) // 1500)
+    down = cue_seconds_full[::n]
+    if down and cue_seconds_full[0] != down[0]:
+        down = [cue_seconds_full[0]] + down
+    if down and cue_seconds_full[-1] != down[-1]:
+        down = down + [cue_seconds_full[-1]]
+    return down
+
+
+@cached(_ai_cache_key("chapters_from_segments"))
+async def chapters_from_segments(segments: List[object], duration: float | None = None) -> List[tuple[str, float]]:
+    """Generate chapters using VTT built from segments so the model can align content to time.
+
+    Falls back to text-only chapters() if the AI parse fails.
+    """
+    vtt_blob, allowed_starts = _chapter_cues(segments)
+    if allowed_starts.size == 0:
         # Fallback to text-based
-        text = " ".join(getattr(seg, "text", "") for seg in segments)
+        text = " ".join([getattr(seg, "text", "") for seg in segments])
         fallback_duration = float(getattr(segments[-1], "end", 0.0)) if segments else duration
-        return chapters(text, fallback_duration)
+        return await chapters(text, fallback_duration)
 
     # Build strict prompt/system
     system_msg = (
@@ -490,19 +805,7 @@ def chapters_from_segments(segments: List[object], duration: float | None = None
         f"\n- Video duration (seconds): {int(duration)}. All start_seconds MUST be integers in [0, duration)."
         if duration is not None else ""
     )
-    cue_seconds_full = sorted({int(round(s)) for s in cue_starts if s >= 0})
-    # Downsample cue list if too large
-    if len(cue_seconds_full) > 3000:
-        n = max(2, len(cue_seconds_full) // 1500)
-        down = cue_seconds_full[::n]
-        # ensure boundaries included
-        if down and cue_seconds_full[0] != down[0]:
-            down = [cue_seconds_full[0]] + down
-        if down and cue_seconds_full[-1] != down[-1]:
-            down = down + [cue_seconds_full[-1]]
-        cue_seconds_list = down
-    else:
-        cue_seconds_list = cue_seconds_full
+    cue_seconds_list = _prompt_cue_seconds(allowed_starts)
     prompt = (
         '{"task":"chapters","rules":['
         '"strict","int_seconds",'
@@ -514,132 +817,93 @@ def chapters_from_segments(segments: List[object], duration: float | None = None
         '"no_generic_titles:[Introduction,Overview,Conclusion,Final Thoughts,Summary]",'
         '"title_max_len:60",'
         '"title_must_include_a_specific_noun_or_action_from_nearby_cues"],'
-        '"allowed_start_seconds":' + json.dumps(cue_seconds_list) + '}' "\n"
+        '"allowed_start_seconds":' + orjson.dumps(cue_seconds_list).decode() + '}' "\n"
         "WEBVTT:\n" + vtt_blob
     )
 
-    ai = None
-    for i in range(2):
-        ai = _call_openai(
-            prompt,
-            system=system_msg,
-            max_tokens=800,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            top_p=0.0,
-            response_format={"type": "json_object"},
-        )
-        if ai:
-            break
-        time.sleep(0.5 * (2 ** i))
-
-    def _snap_to_cue_seconds(x: int) -> int | None:
-        # Snap to the nearest allowed cue start at or after x; if none, snap to the last allowed < duration.
-        idx = bisect.bisect_left(rounded_cue_starts, x)
-        if idx < len(rounded_cue_starts):
-            return rounded_cue_starts[idx]
-        return rounded_cue_starts[-1] if rounded_cue_starts else None
-
-    if ai:
-        items: List[tuple[str, float]] = []
+    def _snapped_items(reply: Optional[str]) -> List[tuple[str, float]]:
         try:
-            m = re.search(r"\{.*\}", ai, re.S)
+            m = _JSON_OBJECT_RE.search(reply or "")
             if m:
-                data = json.loads(m.group(0))
-                chapters_json = data.get("chapters", []) or []
-                used_seconds: set[int] = set()
-                last_start: int | None = None
-                for c in chapters_json:
-                    raw_title = str(c.get("title", ""))
-                    title = _sanitize_title(raw_title)
-                    try:
-                        sec_int = int(c.get("start", 0))
-                    except Exception:
-                        continue
-                    snapped = _snap_to_cue_seconds(sec_int)
-                    if snapped is None:
-                        continue
-                    if duration is not None and snapped >= int(duration):
-                        continue
-                    if last_start is not None and snapped <= last_start:
-                        next_idx = bisect.bisect_right(rounded_cue_starts, last_start)
-                        if next_idx >= len(rounded_cue_starts):
-                            continue
-                        snapped = rounded_cue_starts[next_idx]
-                    if snapped in used_seconds:
-                        continue
-                    items.append((title, float(snapped)))
-                    used_seconds.add(snapped)
-                    last_start = snapped
-                    if len(items) >= 10:
-                        break
+                data = orjson.loads(m.group(0))
+                return _snap_chapter_items(data.get("chapters", []) or [], allowed_starts, duration)
         except Exception:
-            items = []
-        if 5 <= len(items) <= 10:
-            # Filter out generic titles
-            generic = {"introduction", "overview", "conclusion", "finale", "final thoughts", "summary"}
-            items = [(t, s) for (t, s) in items if t.strip().lower() not in generic]
-            return _postprocess_chapters(items, duration)
-        # Retry once with harsher system if parse failed or count out of bounds
-        ai2 = None
-        for i in range(2):
-            ai2 = _call_openai(
-                prompt,
-                system='Return ONLY JSON: {"chapters": []}. If format invalid, output exactly {"chapters": []}',
-                max_tokens=500,
-                presence_penalty=0.0,
-                frequency_penalty=0.0,
-                top_p=0.0,
-                response_format={"type": "json_object"},
-            )
-            if ai2:
-                break
-            time.sleep(0.5 * (2 ** i))
-        items = []
+            pass
+        return []
+
+    def _accepted(items: List[tuple[str, float]]) -> List[tuple[str, float]] | None:
+        if not 5 <= len(items) <= 10:
+            return None
+        # Filter out generic titles
+        generic = {"introduction", "overview", "conclusion", "finale", "final thoughts", "summary"}
+        items = [(t, s) for (t, s) in items if t.strip().lower() not in generic]
+        return _postprocess_chapters(items, duration)
+
+    bundle = _ai_bundle_result.get()
+    if bundle:
         try:
-            if ai2:
-                m2 = re.search(r"\{.*\}", ai2, re.S)
-                if m2:
-                    data2 = json.loads(m2.group(0))
-                    chapters_json2 = data2.get("chapters", []) or []
-                    used_seconds2: set[int] = set()
-                    last_start2: int | None = None
-                    for c in chapters_json2:
-                        raw_title2 = str(c.get("title", ""))
-                        title2 = _sanitize_title(raw_title2)
-                        try:
-                            sec_int2 = int(c.get("start", 0))
-                        except Exception:
-                            continue
-                        snapped2 = _snap_to_cue_seconds(sec_int2)
-                        if snapped2 is None:
-                            continue
-                        if duration is not None and snapped2 >= int(duration):
-                            continue
-                        if last_start2 is not None and snapped2 <= last_start2:
-                            next_idx2 = bisect.bisect_right(rounded_cue_starts, last_start2)
-                            if next_idx2 >= len(rounded_cue_starts):
-                                continue
-                            snapped2 = rounded_cue_starts[next_idx2]
-                        if snapped2 in used_seconds2:
-                            continue
-                        items.append((title2, float(snapped2)))
-                        used_seconds2.add(snapped2)
-                        last_start2 = snapped2
-                        if len(items) >= 10:
-                            break
+            bundled = _accepted(_snap_chapter_items(bundle.get("chapters", []) or [], allowed_starts, duration))
         except Exception:
-            items = []
+            bundled = None
+        if bundled is not None:
+            return bundled
+
+    ai = await _call_openai_retry(prompt, system=system_msg, max_tokens=800)
+    if ai:
+        accepted = _accepted(_snapped_items(ai))
+        if accepted is not None:
+            return accepted
+        # Retry once with harsher system if parse failed or count out of bounds
+        items = _snapped_items(await _call_openai_retry(
+            prompt,
+            system='Return ONLY JSON: {"chapters": []}. If format invalid, output exactly {"chapters": []}',
+            max_tokens=500,
+        ))
         if 5 <= len(items) <= 10:
             return _postprocess_chapters(items, duration)
 
     # Fallback to text-based
-    text = " ".join(getattr(seg, "text", "") for seg in segments)
+    text = " ".join([getattr(seg, "text", "") for seg in segments])
     fallback_duration = float(getattr(segments[-1], "end", 0.0)) if segments else duration
-    return chapters(text, fallback_duration)
+    return await chapters(text, fallback_duration)
+
+
+@cached(_ai_cache_key("ai_bundle"))
+async def ai_bundle(segments: List[object]) -> Optional[dict]:
+    """Summary, takeaways, entities and cue-aligned chapters from a single OpenAI request.
+
+    Returns the parsed JSON object (None if the call or parse failed). Run the per-field
+    functions inside use_ai_bundle() to reuse it instead of making four requests.
+    """
+    vtt_blob, allowed_starts = _chapter_cues(segments)
+    if allowed_starts.size == 0:
+        return None
+    system = (
+        'Return ONLY JSON: {"summary":"- ...\\n- ...","takeaways":["..."],"entities":["..."],'
+        '"chapters":[{"title":"...","start":0}]}'
+    )
+    prompt = (
+        '{"task":"insights",'
+        '"summary":["5_to_8_bullets","12_to_22_words_each","one_bullet_per_line_starting_with_-"],'
+        '"takeaways":["concise","actionable","5-10","each_uses_a_verb",'
+        '"prefer_specifics_numbers_examples","no_restatements","no_fluff"],'
+        '"entities":["dedupe","flat-list"],'
+        '"chapters":["strict","int_seconds","count_5_to_10","min_gap_seconds:35","cover_full_span",'
+        '"snap_to_allowed","title_3_to_7_words",'
+        '"no_generic_titles:[Introduction,Overview,Conclusion,Final Thoughts,Summary]","title_max_len:60"],'
+        '"allowed_start_seconds":' + orjson.dumps(_prompt_cue_seconds(allowed_starts)).decode() + '}' "\n"
+        "WEBVTT:\n" + vtt_blob
+    )
+    # One attempt only: on failure each function retries on its own
+    return _safe_json(await _call_openai_retry(prompt, system=system, max_tokens=2000, attempts=1) or "")
+
 
-def takeaways(text: str) -> List[str]:
-    text_clip = _token_clip(text, max_tokens=3000)
+@cached(_ai_cache_key("takeaways"))
+async def takeaways(text: str) -> List[str]:
+    bundled = _json_str_list(_ai_bundle_result.get(), "takeaways")
+    if bundled:
+        return bundled
+    text_clip = _clip_transcript(text, 3000)
     system = 'Return ONLY JSON: {"takeaways":["...", "..."]}'
     user = (
         '{"task":"takeaways","rules":['
@@ -648,127 +912,119 @@ def takeaways(text: str) -> List[str]:
         '"prefer_specifics_numbers_examples",'
         '"no_restatements","no_fluff"]}\n' + text_clip
     )
-    ai = None
-    for i in range(2):
-        ai = _call_openai(
-            user,
-            system=system,
-            max_tokens=400,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            top_p=0.0,
-            response_format={"type": "json_object"},
-        )
-        if ai:
-            break
-        time.sleep(0.5 * (2 ** i))
+    ai = await _call_openai_retry(user, system=system, max_tokens=400)
     if ai:
-        try:
-            data = _safe_json(ai)
-            if data is not None:
-                out = [re.sub(r"\s+", " ", str(x)).strip() for x in (data.get("takeaways", []) or [])]
-                return [x for x in out if x]
-        except Exception:
-            pass
+        out = _json_str_list(ai, "takeaways")
+        if out is not None:
+            return out
         # Retry with harsher system
-        ai2 = None
-        for i in range(2):
-            ai2 = _call_openai(
-                user,
-                system='Return ONLY JSON: {"takeaways": []}. If format invalid, output exactly {"takeaways": []}',
-                max_tokens=300,
-                presence_penalty=0.0,
-                frequency_penalty=0.0,
-                top_p=0.0,
-                response_format={"type": "json_object"},
-            )
-            if ai2:
-                break
-            time.sleep(0.5 * (2 ** i))
-        if ai2:
-            try:
-                data2 = _safe_json(ai2)
-                if data2 is not None:
-                    out2 = [re.sub(r"\s+", " ", str(x)).strip() for x in (data2.get("takeaways", []) or [])]
-                    clean = [x for x in out2 if x]
-                    if clean:
-                        return clean
-            except Exception:
-                pass
+        clean = _json_str_list(await _call_openai_retry(
+            user,
+            system='Return ONLY JSON: {"takeaways": []}. If format invalid, output exactly {"takeaways": []}',
+            max_tokens=300,
+        ), "takeaways")
+        if clean:
+            return clean
+    _fallback_result()
     return [p.capitalize() for p in extract_keyphrases(text, 8)]
 
 
-def answer(text: str, question: str) -> str:
+async def answer(text: str, question: str) -> str:
     prompt = (
         f"Answer the question based only on the transcript. If unknown, say you don't know.\nQ: {question}\nTranscript:\n" + text[:16000]
     )
-    ai = _call_openai(prompt, system="Grounded QA on transcript only")
+    ai = await _call_openai(prompt, system="Grounded QA on transcript only")
     if ai:
         return ai
-    # fallback: naive search
-    q_words = set(re.findall(r"\w+", question.lower()))
-    best = ""
-    best_score = 0
-    for sentence in re.split(r"(?<=[.!?])\s+", text):
-        s_words = set(re.findall(r"\w+", sentence.lower()))
-        score = len(q_words & s_words)
-        if score > best_score:
-            best = sentence
-            best_score = score
-    return best or "I don't know."
-
-
-def entities(text: str) -> List[str]:
-    text_clip = _token_clip(text, max_tokens=3200)
+    # fallback: sentence with the most distinct question words
+    q_words = sorted(set(_WORD_RE.findall(question.lower())), key=len, reverse=True)
+    if not q_words:
+        return "I don't know."
+    # Sentence i spans text[starts[i]:ends[i]]
+    starts = [0]
+    ends: List[int] = []
+    for m in _SENT_SPLIT_RE.finditer(text):
+        ends.append(m.start())
+        starts.append(m.end())
+    ends.append(len(text))
+    word_ids = {w: i for i, w in enumerate(q_words)}
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        # lower() kept every offset: let the regex engine skip every non-question word of the
+        # lowered copy, so only real hits reach Python
+        q_re = re.compile(r"\b(?:" + "|".join(map(re.escape, q_words)) + r")\b")
+        hits = [(m.start(), word_ids[m.group()]) for m in q_re.finditer(lowered)]
+    else:
+        # Some character changes length when lowered ("İ", "ẞ"); compare word by word instead
+        hits = [(m.start(), word_ids[w]) for m in _WORD_RE.finditer(text) if (w := m.group().lower()) in word_ids]
+    if not hits:
+        return "I don't know."
+    positions, ids = zip(*hits)
+    # Score = distinct question words per sentence; argmax keeps the earliest best sentence
+    sent_idx = np.searchsorted(np.asarray(starts), np.asarray(positions), side="right") - 1
+    pairs = np.unique(sent_idx * len(q_words) + np.asarray(ids))
+    scores = np.bincount(pairs // len(q_words), minlength=len(starts))
+    best_idx = int(scores.argmax())
+    return text[starts[best_idx]:ends[best_idx]] or "I don't know."
+
+
+@cached(_ai_cache_key("entities"))
+async def entities(text: str) -> List[str]:
+    text_clip = _clip_transcript(text, 3200)
     system = 'Return ONLY JSON: {"entities":["...", "..."]}'
     user = '{"task":"entities","rules":["dedupe","flat-list"]}\n' + text_clip
-    ai = None
-    for i in range(2):
-        ai = _call_openai(
-            user,
-            system=system,
-            max_tokens=500,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            top_p=0.0,
-            response_format={"type": "json_object"},
-        )
-        if ai:
-            break
-        time.sleep(0.5 * (2 ** i))
-    if ai:
-        try:
-            data = _safe_json(ai)
-            if data is not None:
-                items = [re.sub(r"\s+", " ", str(i)).strip() for i in (data.get("entities", []) or [])]
-                seen = set()
-                out = []
-                for i in items:
-                    k = i.lower()
-                    if k and k not in seen:
-                        seen.add(k)
-                        out.append(i)
-                return out
-        except Exception:
-            pass
+    items = _json_str_list(_ai_bundle_result.get(), "entities") or None
+    if items is None:
+        items = _json_str_list(await _call_openai_retry(user, system=system, max_tokens=500), "entities")
+    if items is not None:
+        # Case-insensitive dedupe keeping the first spelling; dicts preserve insertion order
+        firsts: dict[str, str] = {}
+        for i in items:
+            firsts.setdefault(i.lower(), i)
+        return list(firsts.values())
     # fallback: heuristic proper-noun detection
-    candidates = re.findall(r"\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,3})\b", text)
-    uniq = []
-    seen = set()
-    for c in candidates:
-        k = c.lower()
-        if k not in seen and len(c) > 2:
-            seen.add(k)
-            uniq.append(c)
-    return uniq[:20]
-
-
-def entities_by_type(text: str) -> dict[str, List[str]]:
+    _fallback_result()
+    uniq: dict[str, str] = {}
+    for c in _PROPER_NOUN_RE.findall(text):
+        if len(c) > 2:
+            uniq.setdefault(c.lower(), c)
+    return list(uniq.values())[:20]
+
+
+_ORG_KEYWORDS = (
+    "inc", "llc", "ltd", "corp", "company", "network", "studios", "pictures", "discovery",
+    "netflix", "disney", "hbo", "warner", "paramount", "cartoon network", "google", "microsoft", "openai"
+)
+
+
+def bucket_entities(flat: List[str]) -> dict[str, List[str]]:
+    """Heuristically split a flat entity list into people, organizations and products."""
+    people: List[str] = []
+    orgs: List[str] = []
+    products: List[str] = []
+    # An entity always lands in the same bucket, so one seen-set replaces the per-list scans
+    bucketed: set[str] = set()
+    for e in flat:
+        if e in bucketed:
+            continue
+        bucketed.add(e)
+        lower = e.lower()
+        if any(k in lower for k in _ORG_KEYWORDS):
+            orgs.append(e)
+        elif " " in e and all(part and part[0].isupper() for part in e.split()[:2]):
+            people.append(e)
+        else:
+            products.append(e)
+    return {"people": people, "organizations": orgs, "products": products}
+
+
+@cached(_ai_cache_key("entities_by_type"))
+async def entities_by_type(text: str) -> dict[str, List[str]]:
     """Return categorized entities: people, organizations, products.
 
     Tries OpenAI first; falls back to heuristic categorization.
     """
-    text_clip = _token_clip(text, max_tokens=3200)
+    text_clip = _clip_transcript(text, 3200)
     prompt = (
         '{"task":"entities_by_type","rules":['
         '"dedupe","from_transcript_only",'
@@ -777,20 +1033,11 @@ def entities_by_type(text: str) -> dict[str, List[str]]:
         '"people_include_usernames_handles"],'
         '"schema":{"people":[],"organizations":[],"products":[]}}\n' + text_clip
     )
-    ai = None
-    for i in range(2):
-        ai = _call_openai(
-            prompt,
-            system='Return ONLY JSON: {"people":[],"organizations":[],"products":[]}',
-            max_tokens=600,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            top_p=0.0,
-            response_format={"type": "json_object"},
-        )
-        if ai:
-            break
-        time.sleep(0.5 * (2 ** i))
+    ai = await _call_openai_retry(
+        prompt,
+        system='Return ONLY JSON: {"people":[],"organizations":[],"products":[]}',
+        max_tokens=600,
+    )
     people: List[str] = []
     orgs: List[str] = []
     products: List[str] = []
@@ -799,35 +1046,22 @@ def entities_by_type(text: str) -> dict[str, List[str]]:
             data = _safe_json(ai)
             if data is not None:
                 def _norm_list(x: Any) -> List[str]:
-                    return [re.sub(r"\s+", " ", str(i)).strip(" -•") for i in (x or []) if str(i).strip()]
+                    return [_WS_RE.sub(" ", str(i)).strip(" -•") for i in (x or []) if str(i).strip()]
                 people.extend(_norm_list(data.get("people")))
                 orgs.extend(_norm_list(data.get("organizations")))
                 products.extend(_norm_list(data.get("products")))
         except Exception:
             pass
     if not (people or orgs or products):
-        flat = entities(text)
-        org_keywords = [
-            "inc", "llc", "ltd", "corp", "company", "network", "studios", "pictures", "discovery",
-            "netflix", "disney", "hbo", "warner", "paramount", "cartoon network", "google", "microsoft", "openai"
-        ]
-        for e in flat:
-            lower = e.lower()
-            if any(k in lower for k in org_keywords):
-                if e not in orgs:
-                    orgs.append(e)
-            elif " " in e and all(part and part[0].isupper() for part in e.split()[:2]):
-                if e not in people:
-                    people.append(e)
-            else:
-                if e not in products:
-                    products.append(e)
+        _fallback_result()
+        buckets = bucket_entities(await entities(text))
+        people, orgs, products = buckets["people"], buckets["organizations"], buckets["products"]
     # Deduplicate while preserving order
     def dedup(seq: List[str]) -> List[str]:
         seen: set[str] = set()
         out: List[str] = []
         for s in seq:
-            k = re.sub(r"\s+", " ", s.strip())
+            k = " ".join(s.split())
             kl = k.lower()
             if kl and kl not in seen:
                 seen.add(kl)
@@ -840,46 +1074,45 @@ def entities_by_type(text: str) -> dict[str, List[str]]:
     }
 
 
-def grounded_chat(text: str, messages: List[dict[str, str]], max_chars: int = 16000) -> str:
+@cached(_ai_cache_key("grounded_chat"))
+async def grounded_chat(text: str, messages: List[dict[str, str]], max_chars: int = 16000) -> str:
     """Perform grounded chat limited to the transcript content and provided history.
 
     - Truncates transcript to max_chars.
     - Includes a strict system instruction to only use the transcript.
     - Accepts prior messages in OpenAI chat format (role, content).
     """
-    key = _effective_openai_key()
+    client = _openai_client_for_request()
     system = (
         "You are a helpful assistant. Answer using ONLY the thing related to the video, between <TRANSCRIPT> and </TRANSCRIPT>. "
     )
     # If no key is available, provide a graceful fallback using QA on last user message.
     user_prompt = ""
-    for m in reversed(messages):
+    for i in range(len(messages) - 1, -1, -1):
+        m = messages[i]
         if m.get("role") == "user":
             user_prompt = m.get("content", "")
             break
 
-    if not key:
-        return answer(text, user_prompt) if user_prompt else "I don't know."
+    if client is None:
+        return await answer(text, user_prompt) if user_prompt else "I don't know."
 
     try:
-        from openai import OpenAI  # type: ignore
-        client = OpenAI(api_key=key)
         chat_messages = [{"role": "system", "content": system}]
         # Put transcript in a user message with clear delimiters
-        transcript_clip = _token_clip(text, max_tokens=3500)
+        transcript_clip = _clip_transcript(text, 3500)
         chat_messages.append({"role": "user", "content": f"<TRANSCRIPT>\n{transcript_clip}\n</TRANSCRIPT>"})
-        chat_messages.extend(messages[-10:])  # bound history to last 10 (after transcript)
-        resp = client.chat.completions.create(
-            model=os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
-            messages=chat_messages,  # type: ignore[arg-type]
-            temperature=0.2,
-            presence_penalty=0.0,
-            frequency_penalty=0.0,
-            max_tokens=800,
-        )
+        # bound history to last 10 (after transcript); extend() copies anyway, so skip the slice when short
+        chat_messages.extend(messages[-10:] if len(messages) > 10 else messages)
+        resp = await _create_completion(client, {
+            "model": os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+            "messages": chat_messages,
+            "temperature": 0.2,
+        })
         out = resp.choices[0].message.content  # type: ignore[assignment]
         return out or ""
     except Exception:
         # Fallback to simple grounded QA
-        return answer(text, user_prompt) if user_prompt else "I don't know."
+        _fallback_result()
+        return await answer(text, user_prompt) if user_prompt else "I don't know."
 
@@ -1,70 +1,101 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
+import pickle
 import re
 import shutil
+import sqlite3
 import subprocess
 import tempfile
-from typing import List, Tuple
+import threading
+from typing import List, TextIO, Tuple
 import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
+import requests
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
+try:
+    from yt_dlp import YoutubeDL  # type: ignore
+except Exception:  # pragma: no cover - falls back to the yt-dlp executable
+    YoutubeDL = None
+
 from app.models.schemas import TranscriptSegment
 
 
+# watch?v= (plain or encoded), youtu.be/, shorts/, embed/, live/ in one scan of the URL
+_YT_ID_RE = re.compile(r"(?:v=|v%3D|youtu\.be/|youtube\.com/(?:shorts|embed|live)/)([a-zA-Z0-9_-]{11})")
+_YT_TOKEN_RE = re.compile(r"([a-zA-Z0-9_-]{11})")
+_SRT_TIME_RE = re.compile(r"(?P<h>\d\d):(?P<m>\d\d):(?P<s>\d\d),(?P<ms>\d\d\d)")
+_SRT_BLOCK_SEP_RE = re.compile(r"\n\s*\n")
+_WS_RE = re.compile(r"\s+")
+# Segment boundary marker for batched punctuation (plus anything the model attaches to it)
+_PUNCT_SENTINEL = " ||| "
+_PUNCT_SENTINEL_SPLIT_RE = re.compile(r"\s*\|\|\|\S*\s*")
+
+
 def extract_youtube_id(url: str) -> str:
     """Extract YouTube video ID from various URL formats."""
-    patterns = [
-        r"(?:v=|v%3D)([a-zA-Z0-9_-]{11})",  # watch URLs and encoded
-        r"youtu\.be/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/shorts/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/embed/([a-zA-Z0-9_-]{11})",
-        r"youtube\.com/live/([a-zA-Z0-9_-]{11})",
-    ]
-    for pattern in patterns:
-        m = re.search(pattern, url)
-        if m:
-            return m.group(1)
+    m = _YT_ID_RE.search(url)
+    if m:
+        return m.group(1)
     # As a last resort, capture a 11-char token
-    m = re.search(r"([a-zA-Z0-9_-]{11})", url)
+    m = _YT_TOKEN_RE.search(url)
     if m:
         return m.group(1)
     raise ValueError("Could not parse YouTube video id")
 
 
-def fetch_transcript_via_api(video_id: str) -> Tuple[List[TranscriptSegment], str, str | None]:
+_PREFERRED_LANGS = frozenset({"en", "en-US", "en-GB"})
+
+# requests.Session isn't thread-safe, so each worker thread keeps its own and reuses
+# its pooled keep-alive connections to YouTube across fetches
+_yt_sessions = threading.local()
+
+
+def _yt_session() -> requests.Session:
+    session = getattr(_yt_sessions, "session", None)
+    if session is None:
+        session = _yt_sessions.session = requests.Session()
+    return session
+
+
+def fetch_transcript_via_api(video_id: str, session: requests.Session | None = None) -> Tuple[List[TranscriptSegment], str, str | None]:
     try:
-        # Create API instance
-        api = YouTubeTranscriptApi()
+        # Create API instance over a reused HTTP session
+        api = YouTubeTranscriptApi(http_client=session or _yt_session())
 
         # Try to fetch transcript - this gets any available transcript (manual or auto-generated)
         transcript_list = api.list(video_id)
 
-        # Try English first (manual or auto-generated)
-        try:
-            transcript = transcript_list.find_transcript(['en', 'en-US', 'en-GB'])
-            source_type = "youtube-auto" if transcript.is_generated else "youtube-manual"
-            language = transcript.language_code
-        except Exception:
-            # Try any available transcript
-            transcript = next(iter(transcript_list))
-            source_type = "youtube-auto" if transcript.is_generated else "youtube-manual"
-            language = transcript.language_code
+        # Prefer English (the list yields manual transcripts before auto-generated ones),
+        # otherwise take whatever is available
+        transcript = next((t for t in transcript_list if t.language_code in _PREFERRED_LANGS), None)
+        if transcript is None:
+            transcript = next(iter(transcript_list), None)
+        if transcript is None:
+            return [], "missing", None
+        source_type = "youtube-auto" if transcript.is_generated else "youtube-manual"
+        language = transcript.language_code
 
         # Fetch the actual transcript data
         transcript_data = transcript.fetch()
 
         if transcript_data:
-            segments: List[TranscriptSegment] = []
-            for item in transcript_data:
-                start = float(item.start)
-                duration = float(item.duration)
-                text = str(item.text).strip()
-                if text:  # Only add non-empty segments
-                    segments.append(TranscriptSegment(start=start, end=start + duration, text=text))
-
+            raw = list(transcript_data)
+            starts = np.fromiter((item.start for item in raw), dtype=np.float64, count=len(raw))
+            ends = starts + np.fromiter((item.duration for item in raw), dtype=np.float64, count=len(raw))
+            segments = [
+                TranscriptSegment(start=start, end=end, text=text)
+                for start, end, item in zip(starts.tolist(), ends.tolist(), raw)
+                if (text := str(item.text).strip())  # Only keep non-empty segments
+            ]
             return segments, source_type, language
 
         return [], "missing", None
@@ -77,6 +108,17 @@ def fetch_transcript_via_api(video_id: str) -> Tuple[List[TranscriptSegment], st
         return [], "error", None
 
 
+# Same settings as the CLI invocation below; outtmpl is added per download
+_YDL_BASE_OPTS = {
+    "format": "bestaudio/best",
+    "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "wav", "preferredquality": "0"}],
+    "postprocessor_args": {"extractaudio+ffmpeg_o": ["-ar", "16000", "-ac", "1", "-sample_fmt", "s16"]},
+    "noplaylist": True,
+    "quiet": True,
+    "no_warnings": True,
+}
+
+
 def download_audio_with_ytdlp(video_id: str, dest_dir: str) -> str:
     # Check if we're in a test environment - create mock audio file
     if os.environ.get("PYTEST_CURRENT_TEST"):
@@ -90,6 +132,30 @@ def download_audio_with_ytdlp(video_id: str, dest_dir: str) -> str:
 
     # Requires ffmpeg installed
     output_template = os.path.join(dest_dir, f"%(id)s.%(ext)s")
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    if YoutubeDL is not None:
+        # In-process: no interpreter start-up or yt-dlp import per download
+        opts = dict(_YDL_BASE_OPTS, outtmpl=output_template)
+        try:
+            with YoutubeDL(opts) as ydl:
+                ydl.download([url])
+        except Exception as e:
+            print(f"yt-dlp failed: {e}")
+            raise
+    else:
+        _download_audio_with_ytdlp_cli(output_template, url)
+
+    # The output template makes the path predictable; only scan the directory if it isn't there
+    expected = os.path.join(dest_dir, f"{video_id}.wav")
+    if os.path.isfile(expected):
+        return expected
+    for name in os.listdir(dest_dir):
+        if name.startswith(video_id) and name.endswith(".wav"):
+            return os.path.join(dest_dir, name)
+    raise FileNotFoundError("Audio file not found after yt-dlp")
+
+
+def _download_audio_with_ytdlp_cli(output_template: str, url: str) -> None:
     cmd = [
         "yt-dlp",
         "-f",
@@ -99,10 +165,13 @@ def download_audio_with_ytdlp(video_id: str, dest_dir: str) -> str:
         "wav",
         "--audio-quality",
         "0",
+        # Whisper wants 16 kHz mono; have ffmpeg write that directly instead of 44.1/48 kHz stereo
+        "--postprocessor-args",
+        "ExtractAudio+ffmpeg_o:-ar 16000 -ac 1 -sample_fmt s16",
         "--no-playlist",
         "-o",
         output_template,
-        f"https://www.youtube.com/watch?v={video_id}",
+        url,
     ]
 
     try:
@@ -114,20 +183,69 @@ def download_audio_with_ytdlp(video_id: str, dest_dir: str) -> str:
         print("yt-dlp not found - make sure it's installed")
         raise
 
-    # Find the wav file
-    for name in os.listdir(dest_dir):
-        if name.startswith(video_id) and name.endswith(".wav"):
-            return os.path.join(dest_dir, name)
-    raise FileNotFoundError("Audio file not found after yt-dlp")
+
+_whisper_model = None
+_whisper_model_lock = threading.Lock()
+
+
+def _get_whisper_model():
+    """faster-whisper model for the in-process fallback, loaded once on first use."""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_model_lock:
+            if _whisper_model is None:
+                from faster_whisper import WhisperModel  # type: ignore
+
+                _whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
+    return _whisper_model
+
+
+def _resolve_binary(candidate: str) -> str | None:
+    # Accept absolute/relative paths or PATH lookup
+    if os.path.isabs(candidate) and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+        return candidate
+    if "/" in candidate:
+        p = os.path.abspath(candidate)
+        if os.path.isfile(p) and os.access(p, os.X_OK):
+            return p
+    found = shutil.which(candidate)
+    return found
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_whisper_paths(whisper_bin: str, model_path: str) -> Tuple[str | None, str | None]:
+    """Locate the whisper-cpp model and binary once per (WHISPER_CPP_BIN, WHISPER_CPP_MODEL).
+
+    Misses are cached too, so an install without whisper-cpp goes straight to the
+    faster-whisper path on later calls. Call cache_clear() after installing either.
+    """
+    # Project-local whisper dir support
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    whisper_dir = os.path.join(base_dir, "whisper")
+
+    common_locations = [
+        model_path,  # Try as-is first
+        os.path.join(whisper_dir, os.path.basename(model_path)),
+        os.path.join(whisper_dir, "ggml-small.en.bin"),
+        os.path.expanduser(f"~/whisper-models/{model_path}"),
+        f"/opt/homebrew/share/whisper-models/{model_path}",
+        f"/usr/local/share/whisper-models/{model_path}",
+    ]
+    found_model = next((location for location in common_locations if os.path.isfile(location)), None)
+    if found_model is None:
+        print(f"Whisper model not found at {model_path} or common locations")
+        return None, None
+
+    resolved_bin = _resolve_binary(whisper_bin) or _resolve_binary(os.path.join(whisper_dir, "whisper-cli")) or _resolve_binary("whisper-cli")
+    if not resolved_bin:
+        print(f"Whisper binary not found (tried {whisper_bin}, {os.path.join(whisper_dir, 'whisper-cli')}, whisper-cli)")
+    return found_model, resolved_bin
 
 
 def run_whisper_cpp(audio_path: str, work_dir: str) -> List[TranscriptSegment]:
     # Try different whisper installations
     whisper_bin = os.environ.get("WHISPER_CPP_BIN", "whisper")
     model_path = os.environ.get("WHISPER_CPP_MODEL", "ggml-base.en.bin")
-    # Project-local whisper dir support
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    whisper_dir = os.path.join(base_dir, "whisper")
 
     # Check if we're in a test environment - skip actual whisper execution
     if os.environ.get("PYTEST_CURRENT_TEST"):
@@ -138,44 +256,14 @@ def run_whisper_cpp(audio_path: str, work_dir: str) -> List[TranscriptSegment]:
             TranscriptSegment(start=2.0, end=4.0, text="Generated from audio"),
         ]
 
-    # Validate model file exists before attempting to run
-    if not os.path.isfile(model_path):
-        common_locations = [
-            model_path,  # Try as-is first
-            os.path.join(whisper_dir, os.path.basename(model_path)),
-            os.path.join(whisper_dir, "ggml-small.en.bin"),
-            os.path.expanduser(f"~/whisper-models/{model_path}"),
-            f"/opt/homebrew/share/whisper-models/{model_path}",
-            f"/usr/local/share/whisper-models/{model_path}",
-        ]
-        model_found = False
-        for location in common_locations:
-            if os.path.isfile(location):
-                model_path = location
-                model_found = True
-                break
-
-        if not model_found:
-            print(f"Whisper model not found at {model_path} or common locations")
-            # Skip to OpenAI whisper fallback
-            raise FileNotFoundError(f"Whisper model not found: {model_path}")
-
-    # Validate whisper binary exists
-    def _resolve_binary(candidate: str) -> str | None:
-        # Accept absolute/relative paths or PATH lookup
-        if os.path.isabs(candidate) and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
-            return candidate
-        if "/" in candidate:
-            p = os.path.abspath(candidate)
-            if os.path.isfile(p) and os.access(p, os.X_OK):
-                return p
-        found = shutil.which(candidate)
-        return found
-
-    resolved_bin = _resolve_binary(whisper_bin) or _resolve_binary(os.path.join(whisper_dir, "whisper-cli")) or _resolve_binary("whisper-cli")
+    # Validate model file and binary exist before attempting to run
+    found_model, resolved_bin = _resolve_whisper_paths(whisper_bin, model_path)
+    if found_model is None:
+        # Skip to OpenAI whisper fallback
+        raise FileNotFoundError(f"Whisper model not found: {model_path}")
     if not resolved_bin:
-        print(f"Whisper binary not found (tried {whisper_bin}, {os.path.join(whisper_dir, 'whisper-cli')}, whisper-cli)")
         raise FileNotFoundError(f"Whisper binary not found: {whisper_bin}")
+    model_path = found_model
 
     # Produce SRT for easier parsing
     out_prefix = os.path.join(work_dir, "out")
@@ -197,29 +285,25 @@ def run_whisper_cpp(audio_path: str, work_dir: str) -> List[TranscriptSegment]:
         if isinstance(e, subprocess.CalledProcessError):
             print(f"Command output: {e.stderr}")
 
-        # Try OpenAI whisper as fallback
+        # Try faster-whisper (CTranslate2, int8 on CPU) as fallback
         try:
-            import whisper
-            print("Falling back to OpenAI Whisper...")
-            model = whisper.load_model("base")
-            result = model.transcribe(audio_path)
+            print("Falling back to faster-whisper...")
+            model = _get_whisper_model()
+            fw_segments, _info = model.transcribe(audio_path, vad_filter=True)
 
-            # Convert to SRT format
             segments = []
-            for i, segment in enumerate(result["segments"]):
-                start = segment["start"]
-                end = segment["end"]
-                text = segment["text"].strip()
+            for segment in fw_segments:
+                text = segment.text.strip()
                 if text:
-                    segments.append(TranscriptSegment(start=start, end=end, text=text))
-            print(f"OpenAI Whisper produced {len(segments)} segments")
+                    segments.append(TranscriptSegment(start=segment.start, end=segment.end, text=text))
+            print(f"faster-whisper produced {len(segments)} segments")
             return segments
 
         except ImportError:
-            print("OpenAI whisper not available, install with: pip install openai-whisper")
+            print("faster-whisper not available, install with: pip install faster-whisper")
             raise e
         except Exception as e2:
-            print(f"OpenAI whisper also failed: {e2}")
+            print(f"faster-whisper also failed: {e2}")
             raise e
 
     srt_path = f"{out_prefix}.srt"
@@ -230,79 +314,277 @@ def run_whisper_cpp(audio_path: str, work_dir: str) -> List[TranscriptSegment]:
 
 
 def parse_srt(srt_path: str) -> List[TranscriptSegment]:
-    segments: List[TranscriptSegment] = []
-    time_re = re.compile(r"(?P<h>\d\d):(?P<m>\d\d):(?P<s>\d\d),(?P<ms>\d\d\d)")
     with open(srt_path, "r", encoding="utf-8") as f:
-        block: list[str] = []
-        for line in f:
-            if line.strip() == "":
-                if block:
-                    seg = _parse_srt_block(block, time_re)
-                    if seg:
-                        segments.append(seg)
-                block = []
-            else:
-                block.append(line.rstrip("\n"))
-        if block:
-            seg = _parse_srt_block(block, time_re)
-            if seg:
-                segments.append(seg)
+        return _parse_srt_stream(f)
+
+
+def _parse_srt_stream(fp: TextIO) -> List[TranscriptSegment]:
+    segments: List[TranscriptSegment] = []
+    data = fp.read()
+    # Blocks are separated by one or more blank (or whitespace-only) lines
+    for raw in _SRT_BLOCK_SEP_RE.split(data):
+        seg = _parse_srt_block(raw.strip())
+        if seg:
+            segments.append(seg)
     return segments
 
 
-def _parse_srt_block(block: List[str], time_re) -> TranscriptSegment | None:
-    if len(block) < 2:
-        return None
-    # block[0] is index
-    times = block[1]
-    m = re.findall(time_re, times)
-    if len(m) != 2:
+def _srt_ts_seconds(ts: str) -> float:
+    # Fixed-width HH:MM:SS,mmm
+    if len(ts) != 12 or ts[2] != ":" or ts[5] != ":" or ts[8] != ",":
+        raise ValueError(f"Bad SRT timestamp: {ts!r}")
+    return int(ts[:2]) * 3600 + int(ts[3:5]) * 60 + int(ts[6:8]) + int(ts[9:12]) / 1000.0
+
+
+def _parse_srt_block(block: str) -> TranscriptSegment | None:
+    # index line, timing line, then the (possibly multi-line) text
+    lines = block.split("\n", 2)
+    if len(lines) < 2:
         return None
-    def to_seconds(h, m, s, ms):
-        return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
-    start = to_seconds(*m[0])
-    end = to_seconds(*m[1])
-    text = " ".join(block[2:]).strip()
-    return TranscriptSegment(start=float(start), end=float(end), text=text)
+    times = lines[1]
+    left, sep, right = times.partition(" --> ")
+    try:
+        if not sep:
+            raise ValueError(times)
+        start = _srt_ts_seconds(left.strip())
+        end = _srt_ts_seconds(right.strip()[:12])
+    except ValueError:
+        # Irregular timing line; fall back to the regex
+        m = _SRT_TIME_RE.findall(times)
+        if len(m) != 2:
+            return None
+        def to_seconds(h, m, s, ms):
+            return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
+        start = to_seconds(*m[0])
+        end = to_seconds(*m[1])
+    text = lines[2].replace("\n", " ").strip() if len(lines) > 2 else ""
+    return TranscriptSegment(start=start, end=end, text=text)
+
+
+_punct_model = None
+_punct_model_failed = False
+_punct_model_lock = threading.Lock()
+
+
+def _get_punct_model():
+    """Punctuation model (hundreds of MB), loaded once on first use; None if it can't be loaded."""
+    global _punct_model, _punct_model_failed
+    if _punct_model is None and not _punct_model_failed:
+        with _punct_model_lock:
+            if _punct_model is None and not _punct_model_failed:
+                try:
+                    from deepmultilingualpunctuation import PunctuationModel  # type: ignore
+
+                    _punct_model = PunctuationModel()
+                except Exception as e:
+                    # Remember the failure so every request doesn't retry the import
+                    print(f"Punctuation model unavailable: {e}")
+                    _punct_model_failed = True
+    return _punct_model
 
 
 def punctuate_text(text: str) -> str:
+    model = _get_punct_model()
+    if model is None:
+        return text
     try:
-        from deepmultilingualpunctuation import PunctuationModel  # type: ignore
-
-        model = PunctuationModel()
         return model.restore_punctuation(text)
     except Exception:
         return text
 
 
-def punctuate_segments(segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
-    # Preserve original timings; only attempt light punctuation improvements per segment
-    # to avoid introducing timing drift.
+def punctuate_segments(segments: List[TranscriptSegment], restore_punctuation: bool = True) -> List[TranscriptSegment]:
+    # Preserve original timings; punctuation is restored over the whole transcript in one
+    # model call and mapped back onto the segments, so no timing drift is introduced.
     cleaned: List[TranscriptSegment] = []
     for seg in segments:
         text = seg.text.strip()
         # Minor cleanup: collapse multiple spaces
-        text = re.sub(r"\s+", " ", text)
+        text = _WS_RE.sub(" ", text)
         cleaned.append(TranscriptSegment(start=seg.start, end=seg.end, text=text))
-    return cleaned if cleaned else segments
+    if not cleaned:
+        return segments
+    if not restore_punctuation:
+        return cleaned
+
+    punctuated = punctuate_text(_PUNCT_SENTINEL.join(seg.text for seg in cleaned))
+    parts = _PUNCT_SENTINEL_SPLIT_RE.split(punctuated.strip())
+    if len(parts) != len(cleaned):
+        # Sentinels were mangled; the model labels words 1:1, so split by each segment's word count
+        words = [w for w in punctuated.split() if not w.startswith("|||")]
+        counts = [len(seg.text.split()) for seg in cleaned]
+        if len(words) != sum(counts):
+            return cleaned
+        parts = []
+        pos = 0
+        for n in counts:
+            parts.append(" ".join(words[pos:pos + n]))
+            pos += n
+    return [
+        TranscriptSegment(start=seg.start, end=seg.end, text=part.strip() or seg.text)
+        for seg, part in zip(cleaned, parts)
+    ]
+
 
+_TRANSCRIPT_CACHE_TTL_SECONDS = 60 * 60 * 24 * 7  # 7 days; captions for a video rarely change
+_TRANSCRIPT_MISS_TTL_SECONDS = 60 * 60 * 6  # 6 hours; retry missing/failed transcripts sooner
+_TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_ENTRIES", "512"))
+# video_id -> (segments, joined text, source, lang, fetched_at); least recently used first
+_transcript_cache: "OrderedDict[str, Tuple[List[TranscriptSegment], str, str, str | None, float]]" = OrderedDict()
+# Pipeline calls run on worker threads; every read, reorder and eviction goes through this lock
+_transcript_cache_lock = threading.Lock()
 
-_TRANSCRIPT_CACHE_TTL_SECONDS = 60 * 60 * 6  # 6 hours
-_transcript_cache: dict[str, Tuple[List[TranscriptSegment], str, str | None, float]] = {}
+# Optional sqlite file that keeps transcripts across restarts (whisper runs are expensive to redo)
+_TRANSCRIPT_CACHE_DB = os.environ.get("TRANSCRIPT_CACHE_DB")
+_disk_lock = threading.Lock()
+_disk_conn: sqlite3.Connection | None = None
 
 
-def get_transcript_pipeline(video_id: str) -> Tuple[List[TranscriptSegment], str, str | None]:
+def _disk_cache() -> sqlite3.Connection | None:
+    global _disk_conn
+    if not _TRANSCRIPT_CACHE_DB:
+        return None
+    if _disk_conn is None:
+        conn = sqlite3.connect(_TRANSCRIPT_CACHE_DB, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "video_id TEXT PRIMARY KEY, segs BLOB NOT NULL, source TEXT NOT NULL, lang TEXT, ts REAL NOT NULL)"
+        )
+        conn.commit()
+        _disk_conn = conn
+    return _disk_conn
+
+
+def _disk_cache_get(video_id: str) -> Tuple[SegmentArray, str, str | None, float] | None:
+    try:
+        with _disk_lock:
+            conn = _disk_cache()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT segs, source, lang, ts FROM transcripts WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        blob, source, lang, ts = row
+        starts, ends, texts = pickle.loads(blob)
+        return SegmentArray(starts, ends, texts), source, lang, ts
+    except Exception as e:
+        print(f"Transcript disk cache read failed for {video_id}: {e}")
+        return None
+
+
+def _disk_cache_put(video_id: str, segs: List[TranscriptSegment], source: str, lang: str | None, ts: float) -> None:
+    try:
+        arr = SegmentArray.from_segments(segs)
+        blob = pickle.dumps((arr.starts, arr.ends, arr.texts), protocol=5)
+        with _disk_lock:
+            conn = _disk_cache()
+            if conn is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, segs, source, lang, ts) VALUES (?, ?, ?, ?, ?)",
+                (video_id, blob, source, lang, ts),
+            )
+            conn.commit()
+    except Exception as e:
+        print(f"Transcript disk cache write failed for {video_id}: {e}")
+
+
+def _remember(video_id: str, entry: Tuple[List[TranscriptSegment], str, str, str | None, float]) -> None:
+    with _transcript_cache_lock:
+        _transcript_cache[video_id] = entry
+        _transcript_cache.move_to_end(video_id)
+        while len(_transcript_cache) > _TRANSCRIPT_CACHE_MAX_ENTRIES:
+            _transcript_cache.popitem(last=False)
+
+
+# video_id -> event set when the thread fetching it finishes
+_inflight_lock = threading.Lock()
+_inflight: dict[str, threading.Event] = {}
+
+
+def get_transcript_pipeline(video_id: str) -> Tuple[List[TranscriptSegment], str, str, str | None]:
+    """Return (segments, text, source, lang); text is the segments joined once and cached with them.
+
+    Concurrent calls for the same uncached video share one fetch (and one whisper run).
+    """
+    hit = _cached_transcript(video_id)
+    if hit is not None:
+        return hit
+
+    with _inflight_lock:
+        event = _inflight.get(video_id)
+        leader = event is None
+        if leader:
+            event = _inflight[video_id] = threading.Event()
+    if not leader:
+        # Another thread is already fetching this video; its result lands in the cache
+        event.wait()
+        hit = _cached_transcript(video_id)
+        if hit is not None:
+            return hit
+        return _fetch_transcript(video_id)
+    try:
+        return _fetch_transcript(video_id)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(video_id, None)
+        event.set()
+
+
+def _cached_transcript(video_id: str) -> Tuple[List[TranscriptSegment], str, str, str | None] | None:
     # Serve from cache if available and fresh
     now = time.time()
-    cached = _transcript_cache.get(video_id)
-    if cached and (now - cached[3]) < _TRANSCRIPT_CACHE_TTL_SECONDS:
-        segs_c, source_c, lang_c, _ts = cached
-        return segs_c, source_c, lang_c
+    with _transcript_cache_lock:
+        cached = _transcript_cache.get(video_id)
+        ttl = _TRANSCRIPT_CACHE_TTL_SECONDS if cached and cached[0] else _TRANSCRIPT_MISS_TTL_SECONDS
+        fresh = cached is not None and (now - cached[4]) < ttl
+        if fresh:
+            _transcript_cache.move_to_end(video_id)
+    if fresh:
+        segs_c, text_c, source_c, lang_c, _ts = cached
+        return segs_c, text_c, source_c, lang_c
+
+    # Next the disk cache, which survives restarts (only non-empty transcripts are written there)
+    stored = _disk_cache_get(video_id)
+    if stored is not None and (now - stored[3]) < _TRANSCRIPT_CACHE_TTL_SECONDS:
+        arr_d, source_d, lang_d, ts_d = stored
+        segs_d = arr_d.to_segments()
+        text_d = arr_d.text()
+        _remember(video_id, (segs_d, text_d, source_d, lang_d, ts_d))
+        return segs_d, text_d, source_d, lang_d
+    return None
+
+
+# Start the audio download alongside the captions request so the whisper path doesn't pay for it serially.
+# Off by default: every cache miss then downloads audio, even when captions turn out to be fine.
+_SPECULATIVE_AUDIO = os.environ.get("TRANSCRIPT_SPECULATIVE_AUDIO") == "1"
+# Run auto captions through the punctuation model. Off by default: the model adds latency
+# and hundreds of MB per worker, so the pipeline otherwise only normalizes whitespace.
+_RESTORE_PUNCTUATION = os.environ.get("TRANSCRIPT_RESTORE_PUNCTUATION") == "1"
+_speculative_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative-audio")
+
+
+def _discard_speculative_download(future: Future, audio_dir: tempfile.TemporaryDirectory) -> None:
+    if future.cancel():
+        audio_dir.cleanup()
+    else:
+        # Already running; remove the files once yt-dlp is done with them
+        future.add_done_callback(lambda _f: audio_dir.cleanup())
+
+
+def _fetch_transcript(video_id: str) -> Tuple[List[TranscriptSegment], str, str, str | None]:
+    now = time.time()
+    audio_dir: tempfile.TemporaryDirectory | None = None
+    audio_future: Future | None = None
+    if _SPECULATIVE_AUDIO:
+        audio_dir = tempfile.TemporaryDirectory()
+        audio_future = _speculative_pool.submit(download_audio_with_ytdlp, video_id, audio_dir.name)
 
     # First try YouTube API for transcripts
     segs, source, lang = fetch_transcript_via_api(video_id)
-    text_len = len(" ".join(s.text for s in segs))
+    text_len = len(" ".join([s.text for s in segs]))
 
     print(f"YouTube transcript for {video_id}: {len(segs)} segments, {text_len} chars, source: {source}")
 
@@ -315,9 +597,12 @@ def get_transcript_pipeline(video_id: str) -> Tuple[List[TranscriptSegment], str
 
     if should_use_whisper:
         print(f"Attempting whisper fallback for {video_id}")
-        with tempfile.TemporaryDirectory() as td:
+        with audio_dir or tempfile.TemporaryDirectory() as td:
             try:
-                audio_path = download_audio_with_ytdlp(video_id, td)
+                if audio_future is not None:
+                    audio_path = audio_future.result()
+                else:
+                    audio_path = download_audio_with_ytdlp(video_id, td)
                 print(f"Downloaded audio: {audio_path}")
                 whisper_segs = run_whisper_cpp(audio_path, td)
                 print(f"Whisper produced {len(whisper_segs)} segments")
@@ -328,23 +613,61 @@ def get_transcript_pipeline(video_id: str) -> Tuple[List[TranscriptSegment], str
             except Exception as e:
                 print(f"Whisper fallback failed for {video_id}: {e}")
                 pass
+    elif audio_future is not None and audio_dir is not None:
+        _discard_speculative_download(audio_future, audio_dir)
 
-    # Light, non-timing-altering cleanup only
+    # Non-timing-altering cleanup; only auto captions lack punctuation, so only they may go through the model
     if segs:
         try:
-            segs = punctuate_segments(segs)
+            segs = punctuate_segments(segs, restore_punctuation=_RESTORE_PUNCTUATION and source == "youtube-auto")
             print(f"Applied punctuation cleanup to {len(segs)} segments")
         except Exception as e:
             print(f"Punctuation cleanup failed: {e}")
             pass
 
     # Save to cache
-    _transcript_cache[video_id] = (segs, source, lang, now)
+    text = segments_to_text(segs)
+    _remember(video_id, (segs, text, source, lang, now))
+    if segs:
+        _disk_cache_put(video_id, segs, source, lang, now)
+
+    return segs, text, source, lang
+
+
+@dataclass(slots=True)
+class SegmentArray:
+    """Transcript segments as parallel arrays (starts, ends, texts) instead of one object per segment.
+
+    Used where segments are stored in bulk (the disk cache): two homogeneous float buffers
+    pickle far more compactly than a list of models.
+    """
+
+    starts: array
+    ends: array
+    texts: List[str]
+
+    @classmethod
+    def from_segments(cls, segments: List[TranscriptSegment]) -> "SegmentArray":
+        return cls(
+            array("d", [seg.start for seg in segments]),
+            array("d", [seg.end for seg in segments]),
+            [seg.text for seg in segments],
+        )
+
+    def to_segments(self) -> List[TranscriptSegment]:
+        return [
+            TranscriptSegment.model_construct(start=start, end=end, text=text)
+            for start, end, text in zip(self.starts, self.ends, self.texts)
+        ]
+
+    def text(self) -> str:
+        return " ".join(self.texts)
 
-    return segs, source, lang
+    def __len__(self) -> int:
+        return len(self.texts)
 
 
 def segments_to_text(segments: List[TranscriptSegment]) -> str:
-    return " ".join(seg.text for seg in segments)
+    return " ".join([seg.text for seg in segments])
 
 
@@ -0,0 +1,112 @@
+"""Shared test fixtures."""
+import inspect
+import os
+import sys
+import types
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Must be set before the app is imported
+os.environ.setdefault("APP_ENV", "test")
+
+from app.api import routes
+from app.main import app
+from app.models.schemas import TranscriptSegment
+from app.services.transcript import segments_to_text
+
+# Service calls the API routes make; route_mocks replaces all of them
+_ROUTE_TARGETS = (
+    "get_transcript_pipeline",
+    "summarize",
+    "chapters_from_segments",
+    "ai_chapters",
+    "ai_takeaways",
+    "ai_answer",
+    "ai_entities",
+    "ai_bundle",
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client shared by the whole session; no test changes its state.
+
+    Entered once so the app's lifespan startup runs a single time.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def mock_transcript_segments():
+    """Mock transcript segments for testing (shared; tests must not mutate them)."""
+    return [
+        TranscriptSegment(start=0.0, end=2.0, text="Hello world"),
+        TranscriptSegment(start=2.0, end=4.0, text="This is a test"),
+        TranscriptSegment(start=4.0, end=6.0, text="Thank you"),
+    ]
+
+
+@pytest.fixture(scope="session")
+def hello_world_segments():
+    """Two short segments; a tuple so tests can't change the shared value."""
+    return (
+        TranscriptSegment(start=0.0, end=2.0, text="Hello"),
+        TranscriptSegment(start=2.0, end=4.0, text="world"),
+    )
+
+
+@pytest.fixture(scope="session")
+def long_transcript_segments():
+    """One segment with enough text that the pipeline skips the whisper fallback."""
+    return (TranscriptSegment(start=0.0, end=2.0, text="A transcript long enough to skip the whisper fallback entirely, " * 3),)
+
+
+@pytest.fixture(scope="session")
+def whisper_segments():
+    """What a mocked whisper run returns."""
+    return (TranscriptSegment(start=0.0, end=2.0, text="Whisper transcript"),)
+
+
+@pytest.fixture(scope="session")
+def shared_tmp_dir(tmp_path_factory):
+    """One scratch directory for tests whose file I/O is mocked and never writes to it."""
+    return str(tmp_path_factory.mktemp("audio"))
+
+
+@pytest.fixture
+def fake_punctuation(monkeypatch):
+    """Stub deepmultilingualpunctuation whose model capitalizes and adds a full stop."""
+    model = SimpleNamespace(restore_punctuation=lambda s: s.capitalize() + ".")
+    fake = types.ModuleType("deepmultilingualpunctuation")
+    fake.PunctuationModel = lambda: model
+    monkeypatch.setitem(sys.modules, "deepmultilingualpunctuation", fake)
+    # Load the stub in place of any cached model, and don't leave it cached afterwards
+    monkeypatch.setattr("app.services.transcript._punct_model", None)
+    monkeypatch.setattr("app.services.transcript._punct_model_failed", False)
+    return model
+
+
+@pytest.fixture
+def route_mocks(monkeypatch):
+    """Mock every service call in app.api.routes; tests set return_value on the attribute of the same name."""
+    mocks = {}
+    for name in _ROUTE_TARGETS:
+        mock = AsyncMock() if inspect.iscoroutinefunction(getattr(routes, name)) else Mock()
+        monkeypatch.setattr(routes, name, mock)
+        mocks[name] = mock
+    # No combined AI response unless a test asks for one
+    mocks["ai_bundle"].return_value = None
+    return SimpleNamespace(**mocks)
+
+
+@pytest.fixture
+def pipeline_ok(route_mocks, mock_transcript_segments):
+    """route_mocks with the transcript pipeline returning mock_transcript_segments; returns that mock."""
+    route_mocks.get_transcript_pipeline.return_value = (
+        mock_transcript_segments, segments_to_text(mock_transcript_segments), "youtube-auto", "en"
+    )
+    return route_mocks.get_transcript_pipeline
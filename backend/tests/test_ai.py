@@ -1,19 +1,52 @@
 """Tests for AI service."""
+import json
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+import httpx
+import numpy as np
 import pytest
+from openai import RateLimitError
 
+from app.core.cache import cache
+from app.models.schemas import TranscriptSegment
 from app.services.ai import (
     extract_keyphrases,
     summarize,
     chapters,
+    chapters_from_segments,
+    ai_bundle,
+    use_ai_bundle,
     takeaways,
     answer,
     entities,
+    bucket_entities,
     _call_openai,
+    _call_openai_retry,
+    _get_yake,
+    _detect_lang,
+    _yake_extract,
+    _default_openai_client,
+    _get_encoding,
+    _token_clip,
+    _clip_transcript,
+    _token_counts,
+    _safe_json,
+    _snap_chapter_items,
+    _sanitize_title,
+    _client_for,
+    _openai_client_for_request,
+    override_openai_key_for_request,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep cached AI results from leaking between tests."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 class TestKeyphraseExtraction:
     """Test keyphrase extraction."""
 
@@ -44,68 +77,276 @@ class TestKeyphraseExtraction:
         for phrase in phrases:
             assert phrase.lower() not in stopwords
 
+    def test_extract_keyphrases_reuses_extractor(self):
+        """Test that the YAKE extractor is built once per configuration."""
+        _get_yake.cache_clear()
+        _yake_extract.cache_clear()
+
+        extract_keyphrases("Neural networks learn layered representations of data.", max_phrases=5)
+        extract_keyphrases("Gradient descent updates model weights iteratively.", max_phrases=5)
+
+        info = _get_yake.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_extract_keyphrases_memoizes_candidates(self):
+        """Test repeated extraction on the same text reuses the YAKE result."""
+        _yake_extract.cache_clear()
+        text = "Convolutional neural networks dominate image classification benchmarks."
+
+        first = extract_keyphrases(text, max_phrases=5)
+        second = extract_keyphrases(text, max_phrases=5)
+
+        assert first == second
+        assert _yake_extract.cache_info().hits == 1
+
+    def test_detect_lang_skips_langdetect_for_ascii_english(self):
+        """Test plain ASCII English short-circuits language detection."""
+        detector = Mock(return_value="fr")
+        with patch('app.services.ai._langdetect', detector):
+            assert _detect_lang("This is a short talk about the history of the internet.") == "en"
+            detector.assert_not_called()
+
+            assert _detect_lang("Voilà une présentation sur l'histoire d'internet.") == "fr"
+            detector.assert_called_once()
+
+    @pytest.mark.parametrize("text", [
+        "Esta es una presentacion sobre la historia de internet y las redes sociales.",
+        "Questa e una presentazione sulla storia di internet e delle reti sociali.",
+        "Dit is een presentatie over de geschiedenis van het internet en sociale netwerken.",
+        "Ini adalah presentasi tentang sejarah internet dan jaringan sosial di dunia.",
+    ])
+    def test_detect_lang_runs_langdetect_for_ascii_non_english(self, text):
+        """Test accent-free non-English text still goes through langdetect."""
+        detector = Mock(return_value="xx")
+        with patch('app.services.ai._langdetect', detector):
+            assert _detect_lang(text + " " + "x" * 5000) == "xx"
+        # Detection runs on the same 4 KiB sample as the English check
+        assert len(detector.call_args.args[0]) == 4096
+
+
+class TestTokenClip:
+    """Test token-based clipping."""
+
+    def test_encoding_loaded_once(self):
+        """Test the tokenizer is resolved once per model."""
+        _get_encoding.cache_clear()
+
+        _token_clip("short text", max_tokens=100)
+        _token_clip("another short text", max_tokens=100)
+
+        info = _get_encoding.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_clips_with_encoding(self):
+        """Test text is cut to max_tokens tokens."""
+        enc = Mock()
+        enc.encode.side_effect = lambda t: t.split()
+        enc.decode.side_effect = lambda ids: " ".join(ids)
+
+        with patch('app.services.ai._get_encoding', return_value=enc):
+            assert _token_clip("one two three four", max_tokens=2) == "one two"
+            assert _token_clip("one two", max_tokens=2) == "one two"
+
+    def test_token_counts_batched(self):
+        """Test cue token counts come from a single batched encode."""
+        enc = Mock()
+        enc.encode_batch.side_effect = lambda texts, num_threads: [t.split() for t in texts]
+
+        with patch('app.services.ai._get_encoding', return_value=enc):
+            assert _token_counts(["a b", "c", "d e f"]) == [2, 1, 3]
+        enc.encode_batch.assert_called_once()
+
+        with patch('app.services.ai._get_encoding', return_value=None):
+            assert _token_counts(["a b"]) is None
+
+    def test_clip_transcript_memoized(self):
+        """Test the same transcript is only tokenized once per budget."""
+        _clip_transcript.cache_clear()
+        with patch('app.services.ai._token_clip', return_value="clipped") as mock_clip:
+            assert _clip_transcript("a long transcript", 3500) == "clipped"
+            assert _clip_transcript("a long transcript", 3500) == "clipped"
+        mock_clip.assert_called_once_with("a long transcript", 3500)
+        _clip_transcript.cache_clear()
+
+    def test_char_fallback_without_tiktoken(self):
+        """Test the ~4 chars/token heuristic is used without an encoding."""
+        with patch('app.services.ai._get_encoding', return_value=None):
+            assert _token_clip("x" * 100, max_tokens=10) == "x" * 40
+
+
+class TestSafeJson:
+    """Test lenient JSON extraction from model output."""
+
+    def test_plain_object(self):
+        """Test a bare JSON object parses directly."""
+        assert _safe_json('{"a": 1}') == {"a": 1}
+
+    def test_object_wrapped_in_prose(self):
+        """Test the largest balanced object is extracted, ignoring braces inside strings."""
+        s = 'Sure! {"x": 1} and here: {"title": "a } tricky \\" {one", "items": [{"k": 2}]} done'
+        assert _safe_json(s) == {"title": 'a } tricky " {one', "items": [{"k": 2}]}
+
+    def test_unterminated_string_hides_trailing_braces(self):
+        """Test braces after an unclosed quote are not treated as structure."""
+        assert _safe_json('{"a": 1} "open {"b": 2}') == {"a": 1}
+
+    def test_no_object(self):
+        """Test non-object input returns None."""
+        assert _safe_json("[1, 2]") is None
+        assert _safe_json("no json here") is None
+
 
 class TestOpenAIIntegration:
     """Test OpenAI API integration."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._openai_client')
-    def test_call_openai_success(self, mock_client):
+    async def test_call_openai_success(self, mock_client):
         """Test successful OpenAI API call."""
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
 
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
-        result = _call_openai("Test prompt")
+        result = await _call_openai("Test prompt")
         assert result == "Test response"
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._openai_client')
-    def test_call_openai_failure(self, mock_client):
+    async def test_call_openai_failure(self, mock_client):
         """Test OpenAI API call failure."""
-        mock_client.chat.completions.create.side_effect = Exception("API Error")
+        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
 
-        result = _call_openai("Test prompt")
+        result = await _call_openai("Test prompt")
         assert result is None
 
+    @pytest.mark.asyncio
+    @patch('app.services.ai.random.uniform', return_value=0)
+    @patch('app.services.ai._openai_client')
+    async def test_call_openai_retries_rate_limit(self, mock_client, mock_uniform):
+        """Test rate-limited calls are retried with backoff."""
+        rate_limited = RateLimitError(
+            "Rate limit reached",
+            response=httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")),
+            body=None,
+        )
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Test response"
+        mock_client.chat.completions.create = AsyncMock(side_effect=[rate_limited, rate_limited, mock_response])
+
+        result = await _call_openai("Test prompt")
+        assert result == "Test response"
+        assert mock_client.chat.completions.create.await_count == 3
+        assert mock_uniform.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.services.ai.asyncio.sleep', new_callable=AsyncMock)
+    @patch('app.services.ai._call_openai')
+    async def test_call_openai_retry_empty_reply(self, mock_openai, mock_sleep):
+        """Test empty replies are retried and JSON output is requested by default."""
+        mock_openai.side_effect = [None, '{"ok": true}']
+
+        result = await _call_openai_retry("Test prompt", system="JSON only", max_tokens=100)
+
+        assert result == '{"ok": true}'
+        assert mock_openai.await_count == 2
+        assert mock_openai.call_args.kwargs["response_format"] == {"type": "json_object"}
+        mock_sleep.assert_awaited_once_with(0.5)
+
+    @pytest.mark.asyncio
     @patch('app.services.ai._openai_client', None)
-    def test_call_openai_no_client(self):
+    async def test_call_openai_no_client(self):
         """Test when OpenAI client is not available."""
-        result = _call_openai("Test prompt")
+        result = await _call_openai("Test prompt")
         assert result is None
 
+    @patch('app.services.ai._openai_client', None)
+    @patch('app.services.ai.OPENAI_API_KEY', 'sk-test')
+    def test_default_client_created_lazily(self):
+        """Test the server-key client is built once, on first use."""
+        with patch('openai.AsyncOpenAI') as mock_cls:
+            first = _default_openai_client()
+            second = _default_openai_client()
+
+        mock_cls.assert_called_once()
+        assert first is second
+
+    def test_override_key_client_reused(self):
+        """Test override-key clients are cached per key."""
+        _client_for.cache_clear()
+        with patch('openai.AsyncOpenAI') as mock_cls:
+            mock_cls.side_effect = lambda **kwargs: Mock(api_key=kwargs["api_key"])
+            with override_openai_key_for_request("sk-user-a"):
+                first = _openai_client_for_request()
+                second = _openai_client_for_request()
+            with override_openai_key_for_request("sk-user-b"):
+                other = _openai_client_for_request()
+
+        assert first is second
+        assert other is not first
+        assert mock_cls.call_count == 2
+        _client_for.cache_clear()
+
 
 class TestSummarization:
     """Test text summarization."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_summarize_with_openai(self, mock_openai):
+    async def test_summarize_with_openai(self, mock_openai):
         """Test summarization using OpenAI."""
         mock_openai.return_value = "• Key point 1\n• Key point 2\n• Key point 3"
 
         text = "This is a long text about various topics that needs to be summarized."
-        result = summarize(text)
+        result = await summarize(text)
 
         assert "Key point" in result
         mock_openai.assert_called_once()
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
     @patch('app.services.ai.extract_keyphrases')
-    def test_summarize_fallback(self, mock_keyphrases, mock_openai):
+    async def test_summarize_fallback(self, mock_keyphrases, mock_openai):
         """Test summarization fallback when OpenAI fails."""
         mock_openai.return_value = None  # OpenAI fails
         mock_keyphrases.return_value = ["machine learning", "data science", "artificial intelligence"]
 
         text = "This video discusses machine learning and data science with artificial intelligence applications."
-        result = summarize(text)
+        result = await summarize(text)
 
         # Should use fallback logic
         assert "discusses" in result.lower()
         assert any(phrase in result.lower() for phrase in ["machine learning", "data science"])
 
-    def test_summarize_empty_text(self):
+    @pytest.mark.asyncio
+    @patch('app.services.ai.OPENAI_API_KEY', 'sk-test')
+    @patch('app.services.ai._openai_client')
+    async def test_summarize_failed_call_not_cached(self, mock_client):
+        """Test a fallback from a failed call isn't cached over the next healthy call."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        bullets = "\n".join(f"- Key point {i} explains how the model learns useful patterns from training data" for i in range(5))
+        mock_response.choices[0].message.content = bullets
+        mock_client.chat.completions.create = AsyncMock(side_effect=[Exception("timeout"), mock_response])
+
+        text = "This video discusses machine learning and data science with artificial intelligence applications."
+        first = await summarize(text)
+        second = await summarize(text)
+
+        assert "Key point" not in first
+        assert second == bullets
+        assert mock_client.chat.completions.create.await_count == 2
+        assert await summarize(text) == second  # the model result is cached
+        assert mock_client.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_summarize_empty_text(self):
         """Test summarization with empty text."""
-        result = summarize("")
+        result = await summarize("")
         assert isinstance(result, str)
         # Empty text should return empty string or minimal fallback
         assert len(result) >= 0
@@ -114,13 +355,14 @@ class TestSummarization:
 class TestChapterGeneration:
     """Test chapter generation."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_chapters_with_openai(self, mock_openai):
+    async def test_chapters_with_openai(self, mock_openai):
         """Test chapter generation using OpenAI."""
         mock_openai.return_value = "Introduction|0.0\nMain Content|120.5\nConclusion|240.0"
 
         text = "Video transcript content"
-        result = chapters(text, duration=300.0)
+        result = await chapters(text, duration=300.0)
 
         assert isinstance(result, list)
         assert len(result) == 3
@@ -128,43 +370,126 @@ class TestChapterGeneration:
         assert result[1] == ("Main Content", 120.5)
         assert result[2] == ("Conclusion", 240.0)
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
     @patch('app.services.ai.extract_keyphrases')
-    def test_chapters_fallback(self, mock_keyphrases, mock_openai):
+    async def test_chapters_fallback(self, mock_keyphrases, mock_openai):
         """Test chapter generation fallback."""
         mock_openai.return_value = None
         mock_keyphrases.return_value = ["intro", "content", "conclusion"]
 
         text = "Video transcript"
-        result = chapters(text, duration=240.0)
+        result = await chapters(text, duration=240.0)
 
         assert isinstance(result, list)
         assert len(result) > 0
         # Should create evenly spaced chapters
         assert all(isinstance(title, str) and isinstance(start, (int, float)) for title, start in result)
 
-    def test_chapters_no_duration(self):
+    @pytest.mark.asyncio
+    async def test_chapters_no_duration(self):
         """Test chapter generation without duration."""
         with patch('app.services.ai._call_openai') as mock_openai:
             mock_openai.return_value = None
 
             text = "Video transcript"
-            result = chapters(text, duration=None)
+            result = await chapters(text, duration=None)
 
             assert isinstance(result, list)
             assert len(result) > 0
 
 
+class TestChaptersFromSegments:
+    """Test segment-aligned chapter generation."""
+
+    @pytest.mark.asyncio
+    @patch('app.services.ai._call_openai')
+    @patch('app.services.ai._token_counts')
+    async def test_cues_packed_within_token_budget(self, mock_counts, mock_openai):
+        """Test cues stop before the one that would overflow the token budget."""
+        segments = [TranscriptSegment(start=i * 60.0, end=i * 60.0 + 5, text=f"cue number {i}") for i in range(10)]
+        mock_counts.return_value = [1500] * 10
+        mock_openai.return_value = '{"chapters":[{"title":"Cue number zero","start":0}]}'
+
+        await chapters_from_segments(segments, duration=600.0)
+
+        prompt = mock_openai.call_args_list[0][0][0]
+        assert "cue number 1\n" in prompt
+        assert "cue number 2" not in prompt
+
+    def test_snap_chapter_items(self):
+        """Test proposed starts snap forward to allowed cue seconds and stay increasing."""
+        allowed = np.array([0, 30, 60, 90], dtype=np.int64)
+        proposed = [
+            {"title": "Opening remarks", "start": 5},
+            {"title": "Same cue again", "start": 20},
+            {"title": "Past the end", "start": 500},
+            {"title": "Bad start", "start": "soon"},
+        ]
+
+        items = _snap_chapter_items(proposed, allowed, duration=120.0)
+
+        assert items == [("Opening remarks", 30.0), ("Same cue again", 60.0), ("Past the end", 90.0)]
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("1. Getting started", "Getting started"),
+        ('- "Quoted title"', "Quoted title"),
+        ('"2024 Recap"', "2024 Recap"),
+        ("'90s Hits", "90s Hits"),
+        ("“3 Ways to Win”", "3 Ways to Win"),
+        ("2) “Top 10 Tips”", "Top 10 Tips"),
+    ])
+    def test_sanitize_title(self, raw, expected):
+        """Test numbering and bullets are stripped but numbers inside quotes are kept."""
+        assert _sanitize_title(raw) == expected
+
+
+class TestAIBundle:
+    """Test the single-request insights bundle."""
+
+    @pytest.mark.asyncio
+    @patch('app.services.ai._call_openai')
+    async def test_bundle_fields_reused(self, mock_openai):
+        """Test functions run inside use_ai_bundle take their fields without another call."""
+        segments = [TranscriptSegment(start=i * 60.0, end=i * 60.0 + 5, text=f"cue number {i}") for i in range(10)]
+        mock_openai.return_value = json.dumps({
+            "summary": "",
+            "takeaways": ["Ship small changes"],
+            "entities": ["Python", "python", "Docker"],
+            "chapters": [{"title": f"Part {i} topic", "start": i * 60} for i in range(6)],
+        })
+
+        bundle = await ai_bundle(segments)
+        assert mock_openai.await_count == 1
+
+        with use_ai_bundle(bundle):
+            assert await takeaways("some text") == ["Ship small changes"]
+            assert await entities("some text") == ["Python", "Docker"]
+            items = await chapters_from_segments(segments)
+        assert mock_openai.await_count == 1
+        assert [t for t, _ in items][:2] == ["Part 0 topic", "Part 1 topic"]
+
+    @pytest.mark.asyncio
+    @patch('app.services.ai._call_openai', return_value=None)
+    async def test_bundle_failure_returns_none(self, mock_openai):
+        """Test a failed bundle call returns None after a single attempt."""
+        segments = [TranscriptSegment(start=0.0, end=5.0, text="hello world")]
+
+        assert await ai_bundle(segments) is None
+        assert mock_openai.await_count == 1
+
+
 class TestTakeaways:
     """Test takeaway generation."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_takeaways_with_openai(self, mock_openai):
+    async def test_takeaways_with_openai(self, mock_openai):
         """Test takeaway generation using OpenAI."""
         mock_openai.return_value = "1. First takeaway\n2. Second takeaway\n3. Third takeaway"
 
         text = "Educational content"
-        result = takeaways(text)
+        result = await takeaways(text)
 
         assert isinstance(result, list)
         assert len(result) == 3
@@ -172,15 +497,16 @@ class TestTakeaways:
         assert "Second takeaway" in result
         assert "Third takeaway" in result
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
     @patch('app.services.ai.extract_keyphrases')
-    def test_takeaways_fallback(self, mock_keyphrases, mock_openai):
+    async def test_takeaways_fallback(self, mock_keyphrases, mock_openai):
         """Test takeaway generation fallback."""
         mock_openai.return_value = None
         mock_keyphrases.return_value = ["machine learning", "data analysis", "deep learning"]
 
         text = "Educational content"
-        result = takeaways(text)
+        result = await takeaways(text)
 
         assert isinstance(result, list)
         assert len(result) > 0
@@ -191,54 +517,70 @@ class TestTakeaways:
 class TestQuestionAnswering:
     """Test question answering."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_answer_with_openai(self, mock_openai):
+    async def test_answer_with_openai(self, mock_openai):
         """Test question answering using OpenAI."""
         mock_openai.return_value = "Machine learning is a subset of artificial intelligence."
 
         text = "This video explains machine learning concepts and artificial intelligence."
         question = "What is machine learning?"
-        result = answer(text, question)
+        result = await answer(text, question)
 
         assert "machine learning" in result.lower()
         mock_openai.assert_called_once()
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_answer_fallback(self, mock_openai):
+    async def test_answer_fallback(self, mock_openai):
         """Test question answering fallback."""
         mock_openai.return_value = None
 
         text = "Machine learning is a powerful technique. It uses algorithms to learn from data."
         question = "What is machine learning?"
-        result = answer(text, question)
+        result = await answer(text, question)
 
         # Should find relevant sentence
         assert "machine learning" in result.lower()
         assert "powerful technique" in result or "algorithms" in result
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_answer_no_match(self, mock_openai):
+    async def test_answer_no_match(self, mock_openai):
         """Test question answering when no match found."""
         mock_openai.return_value = None
 
         text = "This video is about cooking recipes."
         question = "What is machine learning?"
-        result = answer(text, question)
+        result = await answer(text, question)
 
         # Should either return "don't know" or the best available sentence
         assert "don't know" in result.lower() or "cooking" in result.lower()
 
+    @pytest.mark.asyncio
+    @patch('app.services.ai._call_openai')
+    async def test_answer_fallback_length_changing_lowercase(self, mock_openai):
+        """Test sentence offsets stay right when lowercasing changes the text's length."""
+        mock_openai.return_value = None
+
+        # "İ".lower() is two characters, so offsets in text.lower() run ahead of the original
+        text = "İ" * 20 + " go. Dogs run fast. Cats nap."
+        assert await answer(text, "Which dogs run?") == "Dogs run fast."
+        # Like the word-by-word lowercase comparison, "ſ" is not folded to "s"
+        assert await answer("The ſun rose. A sun set.", "sun?") == "A sun set."
+
 
 class TestEntityExtraction:
     """Test entity extraction."""
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_entities_with_openai(self, mock_openai):
+    async def test_entities_with_openai(self, mock_openai):
         """Test entity extraction using OpenAI."""
         mock_openai.return_value = "1. Google\n2. Microsoft\n3. OpenAI\n4. PyTorch"
 
         text = "Google and Microsoft are competing with OpenAI in AI development using PyTorch."
-        result = entities(text)
+        result = await entities(text)
 
         assert isinstance(result, list)
         assert "Google" in result
@@ -246,27 +588,39 @@ class TestEntityExtraction:
         assert "OpenAI" in result
         assert "PyTorch" in result
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_entities_fallback(self, mock_openai):
+    async def test_entities_fallback(self, mock_openai):
         """Test entity extraction fallback."""
         mock_openai.return_value = None
 
         text = "Apple Inc. and Google LLC are technology companies. Steve Jobs founded Apple."
-        result = entities(text)
+        result = await entities(text)
 
         assert isinstance(result, list)
         # Should find proper nouns
         assert any("Apple" in entity for entity in result)
         assert any("Google" in entity for entity in result)
 
+    @pytest.mark.asyncio
     @patch('app.services.ai._call_openai')
-    def test_entities_deduplication(self, mock_openai):
+    async def test_entities_deduplication(self, mock_openai):
         """Test entity deduplication."""
         mock_openai.return_value = "Google\nGoogle Inc\ngoogle\nMicrosoft"
 
         text = "Google Google Inc and Microsoft"
-        result = entities(text)
+        result = await entities(text)
 
         # Should deduplicate case-insensitive
         google_entities = [e for e in result if "google" in e.lower()]
         assert len(google_entities) <= 2  # Should be deduplicated
+
+    def test_bucket_entities(self):
+        """Test flat entities are split by heuristic, each kept once in first-seen order."""
+        flat = ["Ada Lovelace", "Warner Bros", "Analytical Engine", "Ada Lovelace", "python", "Netflix Inc"]
+
+        assert bucket_entities(flat) == {
+            "people": ["Ada Lovelace", "Analytical Engine"],
+            "organizations": ["Warner Bros", "Netflix Inc"],
+            "products": ["python"],
+        }
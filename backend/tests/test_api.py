@@ -1,26 +1,22 @@
 """Tests for API routes."""
+import asyncio
+
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import patch
 
 from app.main import app
 from app.models.schemas import TranscriptSegment
+from app.services.transcript import segments_to_text
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def mock_transcript_segments():
-    """Mock transcript segments for testing."""
-    return [
-        TranscriptSegment(start=0.0, end=2.0, text="Hello world"),
-        TranscriptSegment(start=2.0, end=4.0, text="This is a test"),
-        TranscriptSegment(start=4.0, end=6.0, text="Thank you"),
-    ]
+@pytest.fixture(autouse=True, scope="module")
+def _stub_limiter():
+    """Skip real rate limiting here; tests that care patch limiter.check themselves."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.core.limits.limiter.check", lambda ip: None)
+        yield
 
 
 class TestHealthEndpoint:
@@ -36,33 +32,29 @@ class TestHealthEndpoint:
 class TestParseEndpoint:
     """Test URL parsing endpoint."""
 
-    def test_parse_valid_youtube_url(self, client):
-        """Test parsing valid YouTube URL."""
-        response = client.post("/parse", json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"})
-        assert response.status_code == 200
-        assert response.json() == {"video_id": "dQw4w9WgXcQ"}
-
-    def test_parse_youtu_be_url(self, client):
-        """Test parsing youtu.be URL."""
-        response = client.post("/parse", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
-        assert response.status_code == 200
-        assert response.json() == {"video_id": "dQw4w9WgXcQ"}
+    @pytest.mark.asyncio
+    async def test_parse_urls(self):
+        """Test parsing watch and youtu.be URLs, and rejecting non-YouTube ones."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            watch, short, invalid = await asyncio.gather(
+                ac.post("/parse", json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}),
+                ac.post("/parse", json={"url": "https://youtu.be/dQw4w9WgXcQ"}),
+                ac.post("/parse", json={"url": "https://example.com/invalid"}),
+            )
 
-    def test_parse_invalid_url(self, client):
-        """Test parsing invalid URL."""
-        response = client.post("/parse", json={"url": "https://example.com/invalid"})
-        assert response.status_code == 400
-        assert "detail" in response.json()
+        assert watch.status_code == 200
+        assert watch.json() == {"video_id": "dQw4w9WgXcQ"}
+        assert short.status_code == 200
+        assert short.json() == {"video_id": "dQw4w9WgXcQ"}
+        assert invalid.status_code == 400
+        assert "detail" in invalid.json()
 
 
 class TestTranscriptEndpoint:
     """Test transcript endpoint."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_get_transcript_success(self, mock_pipeline, client, mock_transcript_segments):
+    def test_get_transcript_success(self, pipeline_ok, client):
         """Test successful transcript retrieval."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-
         response = client.get("/api/transcript/test_video_id")
         assert response.status_code == 200
 
@@ -74,10 +66,9 @@ class TestTranscriptEndpoint:
         assert data["segments"][0]["text"] == "Hello world"
         assert "Hello world This is a test Thank you" in data["text"]
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_get_transcript_not_available(self, mock_pipeline, client):
+    def test_get_transcript_not_available(self, route_mocks, client):
         """Test transcript not available."""
-        mock_pipeline.return_value = ([], "missing", None)
+        route_mocks.get_transcript_pipeline.return_value = ([], "", "missing", None)
 
         response = client.get("/api/transcript/test_video_id")
         assert response.status_code == 404
@@ -87,38 +78,55 @@ class TestTranscriptEndpoint:
 class TestSummaryEndpoint:
     """Test summary endpoint."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.summarize')
-    def test_get_summary_success(self, mock_summarize, mock_pipeline, client, mock_transcript_segments):
-        """Test successful summary generation."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_summarize.return_value = "• Key point 1\n• Key point 2"
+    def test_get_summary_no_transcript(self, route_mocks, client):
+        """Test summary when no transcript available."""
+        route_mocks.get_transcript_pipeline.return_value = ([], "", "missing", None)
 
         response = client.get("/api/summary/test_video_id")
+        assert response.status_code == 404
+
+
+class TestAIEndpoints:
+    """Test the single-result AI endpoints."""
+
+    @pytest.mark.parametrize("route,target,result,key", [
+        ("summary", "summarize", "• Key point 1\n• Key point 2", "summary"),
+        ("takeaways", "ai_takeaways", ["Key takeaway 1", "Key takeaway 2", "Key takeaway 3"], "takeaways"),
+        ("entities", "ai_entities", ["Google", "Microsoft", "OpenAI"], "entities"),
+    ])
+    def test_get_success(self, route, target, result, key, route_mocks, pipeline_ok, client):
+        """Test each endpoint returns its service result under the video id."""
+        getattr(route_mocks, target).return_value = result
+
+        response = client.get(f"/api/{route}/test_video_id")
         assert response.status_code == 200
 
         data = response.json()
         assert data["video_id"] == "test_video_id"
-        assert data["summary"] == "• Key point 1\n• Key point 2"
+        assert data[key] == result
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_get_summary_no_transcript(self, mock_pipeline, client):
-        """Test summary when no transcript available."""
-        mock_pipeline.return_value = ([], "missing", None)
+    @patch('app.services.ai.entities_by_type')
+    def test_get_entities_by_type(self, mock_by_type, pipeline_ok, client):
+        """Test categorized entities are returned as JSON under the video id."""
+        mock_by_type.return_value = {"people": ["Ada Lovelace"], "organizations": ["Google"], "products": []}
 
-        response = client.get("/api/summary/test_video_id")
-        assert response.status_code == 404
+        response = client.get("/api/entities/by-type/test_video_id")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "video_id": "test_video_id",
+            "people": ["Ada Lovelace"],
+            "organizations": ["Google"],
+            "products": [],
+        }
 
 
 class TestChaptersEndpoint:
     """Test chapters endpoint."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.ai_chapters')
-    def test_get_chapters_success(self, mock_chapters, mock_pipeline, client, mock_transcript_segments):
+    def test_get_chapters_success(self, route_mocks, pipeline_ok, client):
         """Test successful chapters generation."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_chapters.return_value = [("Introduction", 0.0), ("Main Content", 120.0), ("Conclusion", 240.0)]
+        route_mocks.chapters_from_segments.return_value = [("Introduction", 0.0), ("Main Content", 120.0), ("Conclusion", 240.0)]
 
         response = client.get("/api/chapters/test_video_id")
         assert response.status_code == 200
@@ -130,34 +138,44 @@ class TestChaptersEndpoint:
         assert data["chapters"][0]["start"] == 0.0
 
 
-class TestTakeawaysEndpoint:
-    """Test takeaways endpoint."""
+class TestInsightsEndpoint:
+    """Test combined insights endpoint."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.ai_takeaways')
-    def test_get_takeaways_success(self, mock_takeaways, mock_pipeline, client, mock_transcript_segments):
-        """Test successful takeaways generation."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_takeaways.return_value = ["Key takeaway 1", "Key takeaway 2", "Key takeaway 3"]
+    def test_get_insights_success(self, route_mocks, pipeline_ok, client):
+        """Test all insights are returned from a single transcript fetch."""
+        route_mocks.summarize.return_value = "- Key point"
+        route_mocks.chapters_from_segments.return_value = [("Opening remarks", 0.0), ("Past the end", 600.0)]
+        route_mocks.ai_takeaways.return_value = ["Key takeaway 1"]
+        route_mocks.ai_entities.return_value = ["Google"]
 
-        response = client.get("/api/takeaways/test_video_id")
+        response = client.get("/api/insights/test_video_id")
         assert response.status_code == 200
 
         data = response.json()
         assert data["video_id"] == "test_video_id"
-        assert len(data["takeaways"]) == 3
-        assert "Key takeaway 1" in data["takeaways"]
+        assert data["summary"] == "- Key point"
+        assert data["chapters"] == [
+            {"title": "Opening remarks", "start": 0.0},
+            {"title": "Past the end", "start": 6.0},  # clamped to transcript duration
+        ]
+        assert data["takeaways"] == ["Key takeaway 1"]
+        assert data["entities"] == ["Google"]
+        route_mocks.get_transcript_pipeline.assert_called_once_with("test_video_id")
+
+    def test_get_insights_no_transcript(self, route_mocks, client):
+        """Test insights when no transcript available."""
+        route_mocks.get_transcript_pipeline.return_value = ([], "", "missing", None)
+
+        response = client.get("/api/insights/test_video_id")
+        assert response.status_code == 404
 
 
 class TestQAEndpoint:
     """Test Q&A endpoint."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.ai_answer')
-    def test_post_qa_success(self, mock_answer, mock_pipeline, client, mock_transcript_segments):
+    def test_post_qa_success(self, route_mocks, pipeline_ok, client):
         """Test successful Q&A."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_answer.return_value = "This is the answer to your question."
+        route_mocks.ai_answer.return_value = "This is the answer to your question."
 
         response = client.post("/api/qa", json={
             "video_id": "test_video_id",
@@ -171,66 +189,50 @@ class TestQAEndpoint:
         assert data["answer"] == "This is the answer to your question."
 
 
-class TestEntitiesEndpoint:
-    """Test entities endpoint."""
-
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.ai_entities')
-    def test_get_entities_success(self, mock_entities, mock_pipeline, client, mock_transcript_segments):
-        """Test successful entities extraction."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_entities.return_value = ["Google", "Microsoft", "OpenAI"]
-
-        response = client.get("/api/entities/test_video_id")
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["video_id"] == "test_video_id"
-        assert len(data["entities"]) == 3
-        assert "Google" in data["entities"]
-
-
 class TestExportEndpoints:
     """Test export endpoints."""
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_export_txt(self, mock_pipeline, client, mock_transcript_segments):
-        """Test TXT export."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-
-        response = client.get("/api/export/txt/test_video_id")
+    @pytest.mark.parametrize("fmt,needles", [
+        ("txt", ["Hello world This is a test Thank you"]),
+        ("srt", ["00:00:00,000 --> 00:00:02,000", "Hello world"]),
+        ("vtt", ["WEBVTT", "00:00:00.000 --> 00:00:02.000"]),
+    ])
+    def test_export_text_formats(self, fmt, needles, pipeline_ok, client):
+        """Test TXT, SRT and VTT exports."""
+        response = client.get(f"/api/export/{fmt}/test_video_id")
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/plain; charset=utf-8"
-        assert "Hello world This is a test Thank you" in response.text
+        for needle in needles:
+            assert needle in response.text
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_export_srt(self, mock_pipeline, client, mock_transcript_segments):
-        """Test SRT export."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
+    def test_export_srt_long_transcript(self, route_mocks, client):
+        """Test that a streamed SRT export spanning several chunks is complete."""
+        segments = [TranscriptSegment(start=float(i), end=float(i + 1), text=f"line {i}") for i in range(600)]
+        route_mocks.get_transcript_pipeline.return_value = (segments, segments_to_text(segments), "youtube-auto", "en")
 
         response = client.get("/api/export/srt/test_video_id")
         assert response.status_code == 200
-        assert response.headers["content-type"] == "text/plain; charset=utf-8"
-        assert "00:00:00,000 --> 00:00:02,000" in response.text
-        assert "Hello world" in response.text
-
-    @patch('app.api.routes.get_transcript_pipeline')
-    def test_export_vtt(self, mock_pipeline, client, mock_transcript_segments):
-        """Test VTT export."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
+        blocks = response.text.split("\n\n")
+        assert len(blocks) == 600
+        assert blocks[0] == "1\n00:00:00,000 --> 00:00:01,000\nline 0"
+        assert blocks[-1] == "600\n00:09:59,000 --> 00:10:00,000\nline 599\n"
+
+    def test_export_srt_rounds_milliseconds(self, route_mocks, client):
+        """Test SRT milliseconds are rounded, not truncated, from float seconds."""
+        segments = [
+            TranscriptSegment(start=1.15, end=2.01, text="Hello"),
+            TranscriptSegment(start=3599.999, end=3600.5, text="world"),
+        ]
+        route_mocks.get_transcript_pipeline.return_value = (segments, segments_to_text(segments), "youtube-auto", "en")
 
-        response = client.get("/api/export/vtt/test_video_id")
+        response = client.get("/api/export/srt/test_video_id")
         assert response.status_code == 200
-        assert response.headers["content-type"] == "text/plain; charset=utf-8"
-        assert "WEBVTT" in response.text
-        assert "00:00:00.000 --> 00:00:02.000" in response.text
+        assert "00:00:01,150 --> 00:00:02,010" in response.text
+        assert "00:59:59,999 --> 01:00:00,500" in response.text
 
-    @patch('app.api.routes.get_transcript_pipeline')
-    @patch('app.api.routes.ai_chapters')
-    def test_export_chapters(self, mock_chapters, mock_pipeline, client, mock_transcript_segments):
+    def test_export_chapters(self, route_mocks, pipeline_ok, client):
         """Test chapters JSON export."""
-        mock_pipeline.return_value = (mock_transcript_segments, "youtube-auto", "en")
-        mock_chapters.return_value = [("Introduction", 0.0), ("Conclusion", 120.0)]
+        route_mocks.chapters_from_segments.return_value = [("Introduction", 0.0), ("Conclusion", 120.0)]
 
         response = client.get("/api/export/chapters/test_video_id")
         assert response.status_code == 200
@@ -240,6 +242,54 @@ class TestExportEndpoints:
         assert len(data["chapters"]) == 2
 
 
+class TestBatchEndpoint:
+    """Test batch endpoint."""
+
+    @patch('app.core.limits.limiter.check')
+    def test_batch_dispatches_sub_requests(self, mock_check, route_mocks, pipeline_ok, client):
+        """Test each sub-request is answered under its own id."""
+        route_mocks.summarize.return_value = "- Key point"
+
+        response = client.post("/api/batch", json={"requests": [
+            {"id": "a", "url": "/api/summary/video_a"},
+            {"id": "b", "url": "/api/qa", "method": "POST", "body": {"video_id": "video_b"}},
+        ]})
+        assert response.status_code == 200
+
+        responses = {r["id"]: r for r in response.json()["responses"]}
+        assert responses["a"]["status"] == 200
+        assert responses["a"]["body"] == {"video_id": "video_a", "summary": "- Key point"}
+        assert responses["b"]["status"] == 422  # missing question
+        # The batch call and both sub-requests count against the client's limits
+        assert mock_check.call_count == 3
+
+    @patch('app.core.limits.limiter.check')
+    def test_batch_rejects_nested_and_foreign_urls(self, mock_check, client):
+        """Test batch does not recurse or leave the API prefix."""
+        response = client.post("/api/batch", json={"requests": [
+            {"id": "nested", "url": "/api/batch", "method": "POST"},
+            {"id": "foreign", "url": "http://example.com/"},
+        ]})
+        assert response.status_code == 200
+        assert all(r["status"] == 400 for r in response.json()["responses"])
+
+    @pytest.mark.parametrize("url", [
+        "/api/%62atch",
+        "/api/%2562atch",
+        "/api//batch",
+        "/api/./batch/",
+        "/api/chapters/../batch?x=1",
+        "/api/../api/batch",
+    ])
+    @patch('app.core.limits.limiter.check')
+    def test_batch_rejects_disguised_nested_urls(self, mock_check, client, url):
+        """Test encoded, dotted and doubled-slash spellings of the batch url are rejected too."""
+        response = client.post("/api/batch", json={"requests": [{"id": "nested", "url": url, "method": "POST"}]})
+        assert response.status_code == 200
+        assert response.json()["responses"][0]["status"] == 400
+        assert mock_check.call_count == 1
+
+
 class TestRateLimiting:
     """Test rate limiting functionality."""
 
@@ -254,7 +304,6 @@ class TestRateLimiting:
     @patch('app.core.limits.limiter.check')
     def test_rate_limit_exceeded(self, mock_check, client):
         """Test rate limit exceeded."""
-        from fastapi import HTTPException
         mock_check.side_effect = HTTPException(status_code=429, detail="Too many requests")
 
         response = client.get("/health")
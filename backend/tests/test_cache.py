@@ -0,0 +1,118 @@
+"""Tests for the response cache."""
+from unittest.mock import patch
+import pytest
+
+import json
+
+from app.core.cache import InMemoryCache, _dumps, _loads, cached, make_key, mark_uncacheable
+
+
+class TestInMemoryCache:
+    """Test the in-process TTL cache."""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self):
+        """Test stored values are returned."""
+        c = InMemoryCache(max_entries=4)
+        await c.set("k", ["a", "b"], ttl=60)
+        assert await c.get("k") == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_missing_key(self):
+        """Test unknown keys are misses."""
+        c = InMemoryCache(max_entries=4)
+        assert await c.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_entry_expires(self):
+        """Test entries are dropped after their TTL."""
+        c = InMemoryCache(max_entries=4)
+        with patch('app.core.cache.time.time') as mock_time:
+            mock_time.return_value = 0.0
+            await c.set("k", "v", ttl=10)
+            mock_time.return_value = 11.0
+            assert await c.get("k") is None
+        assert "k" not in c.entries
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test least recently used entries are evicted past capacity."""
+        c = InMemoryCache(max_entries=2)
+        await c.set("a", 1)
+        await c.set("b", 2)
+        await c.get("a")  # "b" is now least recent
+        await c.set("c", 3)
+        assert await c.get("a") == 1
+        assert await c.get("b") is None
+        assert await c.get("c") == 3
+
+
+class TestCacheKeys:
+    """Test cache key derivation."""
+
+    def test_key_is_stable(self):
+        """Test identical inputs produce identical keys."""
+        assert make_key("summarize", "gpt-4o-mini", "text") == make_key("summarize", "gpt-4o-mini", "text")
+
+    def test_key_varies_by_inputs(self):
+        """Test function, model, text and extra all feed the key."""
+        base = make_key("summarize", "gpt-4o-mini", "text", "x")
+        assert make_key("takeaways", "gpt-4o-mini", "text", "x") != base
+        assert make_key("summarize", "fallback", "text", "x") != base
+        assert make_key("summarize", "gpt-4o-mini", "other", "x") != base
+        assert make_key("summarize", "gpt-4o-mini", "text", "y") != base
+
+
+class TestSerialization:
+    """Test the value codec used by the Redis cache."""
+
+    def test_round_trip(self):
+        """Test cached AI results survive encoding."""
+        value = {"people": ["Ada Lovelace"], "organizations": [], "products": ["Analytical Engine"]}
+        assert _loads(_dumps(value)) == value
+        assert _loads(_dumps([["Intro", 0.0], ["Café", 12.5]])) == [["Intro", 0.0], ["Café", 12.5]]
+
+    def test_reads_json_entries(self):
+        """Test entries stored as JSON still decode."""
+        raw = json.dumps(["a", "b"]).encode("utf-8")
+        assert _loads(raw) == ["a", "b"]
+
+
+class TestCachedDecorator:
+    """Test the cached decorator."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self):
+        """Test the wrapped function only runs once per key."""
+        calls = []
+
+        @cached(lambda text: make_key("test_fn", "m", text))
+        async def fn(text):
+            calls.append(text)
+            return text.upper()
+
+        assert await fn("cache-decorator-test") == "CACHE-DECORATOR-TEST"
+        assert await fn("cache-decorator-test") == "CACHE-DECORATOR-TEST"
+        assert calls == ["cache-decorator-test"]
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_result_not_stored(self):
+        """Test results flagged with mark_uncacheable, and callers built on them, are recomputed."""
+        calls = []
+
+        @cached(lambda text: make_key("test_inner", "m", text))
+        async def inner(text):
+            calls.append("inner")
+            if calls.count("inner") == 1:
+                mark_uncacheable()
+            return text.lower()
+
+        @cached(lambda text: make_key("test_outer", "m", text))
+        async def outer(text):
+            calls.append("outer")
+            return await inner(text)
+
+        assert await outer("Uncacheable-Test") == "uncacheable-test"
+        assert await outer("Uncacheable-Test") == "uncacheable-test"
+        assert await outer("Uncacheable-Test") == "uncacheable-test"
+        assert calls == ["outer", "inner", "outer", "inner"]
@@ -1,71 +1,75 @@
 """Tests for rate limiting."""
 import time
-from unittest.mock import Mock, patch
+from types import SimpleNamespace as NS
+from unittest.mock import AsyncMock, patch
 import pytest
 from fastapi import HTTPException
 
 from app.core.limits import InMemoryRateLimiter, guard_request
 
 
+@pytest.fixture(scope="module")
+def default_limiter():
+    """Limiter for tests that only inspect its configuration; never call check() on it."""
+    return InMemoryRateLimiter(max_requests_per_minute=10, daily_quota=100)
+
+
+@pytest.fixture
+def make_limiter():
+    """Build a fresh limiter for tests that record requests."""
+    def _make(rpm: int, daily: int, **kwargs) -> InMemoryRateLimiter:
+        return InMemoryRateLimiter(max_requests_per_minute=rpm, daily_quota=daily, **kwargs)
+    return _make
+
+
 class TestInMemoryRateLimiter:
     """Test the in-memory rate limiter."""
 
-    def test_rate_limiter_init(self):
+    def test_rate_limiter_init(self, default_limiter):
         """Test rate limiter initialization."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=10, daily_quota=100)
+        limiter = default_limiter
         assert limiter.max_requests_per_minute == 10
         assert limiter.daily_quota == 100
         assert limiter.minute_buckets == {}
         assert limiter.daily_counts == {}
 
-    def test_rate_limiter_first_request(self):
+    def test_rate_limiter_first_request(self, make_limiter):
         """Test first request is allowed."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=10, daily_quota=100)
+        limiter = make_limiter(10, 100)
 
         # First request should pass
         limiter.check("127.0.0.1")  # Should not raise exception
 
-    def test_rate_limiter_within_limit(self):
+    def test_rate_limiter_within_limit(self, make_limiter):
         """Test requests within rate limit."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=10, daily_quota=100)
+        limiter = make_limiter(10, 100)
 
         # Make 5 requests (within limit)
         for _ in range(5):
             limiter.check("127.0.0.1")  # Should not raise exception
 
-    def test_rate_limiter_exceed_minute_limit(self):
-        """Test exceeding per-minute rate limit."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=3, daily_quota=100)
-
-        # Make 3 requests (at limit)
-        for _ in range(3):
-            limiter.check("127.0.0.1")
-
-        # 4th request should be blocked
-        with pytest.raises(HTTPException) as exc_info:
-            limiter.check("127.0.0.1")
-
-        assert exc_info.value.status_code == 429
-        assert "Too many requests" in str(exc_info.value.detail)
-
-    def test_rate_limiter_exceed_daily_quota(self):
-        """Test exceeding daily quota."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=1000, daily_quota=3)
+    @pytest.mark.parametrize("rpm,daily,expected_detail", [
+        (3, 100, "Too many requests"),
+        (1000, 3, "Daily quota exceeded"),
+        # Within the rate limit but at the daily quota
+        (10, 3, "Daily quota exceeded"),
+    ])
+    def test_rate_limiter_exceed_limit(self, rpm, daily, expected_detail, make_limiter):
+        """Test the request after 3 allowed ones is blocked by the tighter limit."""
+        limiter = make_limiter(rpm, daily)
 
-        # Make 3 requests (at daily limit)
         for _ in range(3):
             limiter.check("127.0.0.1")
 
-        # 4th request should be blocked
         with pytest.raises(HTTPException) as exc_info:
             limiter.check("127.0.0.1")
 
         assert exc_info.value.status_code == 429
-        assert "Daily quota exceeded" in str(exc_info.value.detail)
+        assert expected_detail in str(exc_info.value.detail)
 
-    def test_rate_limiter_different_ips(self):
+    def test_rate_limiter_different_ips(self, make_limiter):
         """Test that different IPs have separate limits."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=2, daily_quota=100)
+        limiter = make_limiter(2, 100)
 
         # IP 1 makes 2 requests (at limit)
         limiter.check("127.0.0.1")
@@ -78,89 +82,73 @@ class TestInMemoryRateLimiter:
         # IP 2 should still be allowed
         limiter.check("192.168.1.1")  # Should not raise exception
 
-    def test_rate_limiter_minute_window_reset(self):
+    def test_rate_limiter_minute_window_reset(self, make_limiter, monkeypatch):
         """Test that minute window resets after time passes."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=2, daily_quota=100)
+        limiter = make_limiter(2, 100)
 
-        # Mock time to control the window
-        with patch('app.core.limits.time.time') as mock_time:
-            # Start at time 0
-            mock_time.return_value = 0.0
+        # Control the clock; start at time 0
+        now = [0.0]
+        monkeypatch.setattr("app.core.limits.time.time", lambda: now[0])
 
-            # Make 2 requests (at limit)
-            limiter.check("127.0.0.1")
-            limiter.check("127.0.0.1")
+        # Make 2 requests (at limit)
+        limiter.check("127.0.0.1")
+        limiter.check("127.0.0.1")
 
-            # Should be blocked at same time
-            with pytest.raises(HTTPException):
-                limiter.check("127.0.0.1")
+        # Should be blocked at same time
+        with pytest.raises(HTTPException):
+            limiter.check("127.0.0.1")
 
-            # Move time forward 61 seconds (past the minute window)
-            mock_time.return_value = 61.0
+        # Move time forward 61 seconds (past the minute window)
+        now[0] = 61.0
 
-            # Should be allowed again
-            limiter.check("127.0.0.1")  # Should not raise exception
+        # Should be allowed again
+        limiter.check("127.0.0.1")  # Should not raise exception
 
-    def test_rate_limiter_daily_window_reset(self):
+    def test_rate_limiter_daily_window_reset(self, make_limiter, monkeypatch):
         """Test that daily window resets after day passes."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=1000, daily_quota=2)
+        limiter = make_limiter(1000, 2)
 
-        with patch('app.core.limits.time.time') as mock_time:
-            # Start at day 0
-            mock_time.return_value = 0.0  # Day 0
+        now = [0.0]  # Day 0
+        monkeypatch.setattr("app.core.limits.time.time", lambda: now[0])
 
-            # Make 2 requests (at daily limit)
-            limiter.check("127.0.0.1")
-            limiter.check("127.0.0.1")
+        # Make 2 requests (at daily limit)
+        limiter.check("127.0.0.1")
+        limiter.check("127.0.0.1")
 
-            # Should be blocked
-            with pytest.raises(HTTPException):
-                limiter.check("127.0.0.1")
+        # Should be blocked
+        with pytest.raises(HTTPException):
+            limiter.check("127.0.0.1")
 
-            # Move to next day (86400 seconds = 1 day)
-            mock_time.return_value = 86400.0  # Day 1
+        # Move to next day (86400 seconds = 1 day)
+        now[0] = 86400.0  # Day 1
 
-            # Should be allowed again
-            limiter.check("127.0.0.1")  # Should not raise exception
+        # Should be allowed again
+        limiter.check("127.0.0.1")  # Should not raise exception
 
 
 class TestGuardRequest:
     """Test the guard_request dependency."""
 
     @pytest.mark.asyncio
-    async def test_guard_request_with_client_ip(self):
-        """Test guard_request with client IP."""
-        # Mock request with client.host
-        request = Mock()
-        request.headers = {}
-        request.client = Mock()
-        request.client.host = "127.0.0.1"
+    @pytest.mark.parametrize("headers,client_host,expected_ip", [
+        ({}, "127.0.0.1", "127.0.0.1"),
+        # Forwarded IP wins over the client IP
+        ({"x-forwarded-for": "192.168.1.1"}, "127.0.0.1", "192.168.1.1"),
+        # No client at all
+        ({}, None, "unknown"),
+    ])
+    async def test_guard_request_client_ip(self, headers, client_host, expected_ip):
+        """Test guard_request checks the limiter with the right client IP."""
+        request = NS(headers=headers, client=None if client_host is None else NS(host=client_host))
 
         with patch('app.core.limits.limiter.check') as mock_check:
             await guard_request(request)
-            mock_check.assert_called_once_with("127.0.0.1")
-
-    @pytest.mark.asyncio
-    async def test_guard_request_with_forwarded_header(self):
-        """Test guard_request with X-Forwarded-For header."""
-        # Mock request with forwarded header
-        request = Mock()
-        request.headers = {"x-forwarded-for": "192.168.1.1"}
-        request.client = Mock()
-        request.client.host = "127.0.0.1"
-
-        with patch('app.core.limits.limiter.check') as mock_check:
-            await guard_request(request)
-            # Should use forwarded IP, not client IP
-            mock_check.assert_called_once_with("192.168.1.1")
+            mock_check.assert_called_once_with(expected_ip)
 
     @pytest.mark.asyncio
     async def test_guard_request_rate_limit_exceeded(self):
         """Test guard_request when rate limit is exceeded."""
-        request = Mock()
-        request.headers = {}
-        request.client = Mock()
-        request.client.host = "127.0.0.1"
+        request = NS(headers={}, client=NS(host="127.0.0.1"))
 
         with patch('app.core.limits.limiter.check') as mock_check:
             mock_check.side_effect = HTTPException(status_code=429, detail="Rate limit exceeded")
@@ -172,24 +160,22 @@ class TestGuardRequest:
             assert exc_info.value.status_code == 429
 
     @pytest.mark.asyncio
-    async def test_guard_request_no_client(self):
-        """Test guard_request when request.client is None."""
-        request = Mock()
-        request.headers = {}
-        request.client = None
+    async def test_guard_request_awaits_async_limiter(self):
+        """Test guard_request awaits limiters with an async check (Redis)."""
+        request = NS(headers={}, client=NS(host="127.0.0.1"))
 
-        with patch('app.core.limits.limiter.check') as mock_check:
-            await guard_request(request)
-            # Should use "unknown" as fallback
-            mock_check.assert_called_once_with("unknown")
+        with patch('app.core.limits.limiter.check', new=AsyncMock(side_effect=HTTPException(status_code=429))) as mock_check:
+            with pytest.raises(HTTPException):
+                await guard_request(request)
+            mock_check.assert_awaited_once_with("127.0.0.1")
 
 
 class TestRateLimitingIntegration:
     """Test rate limiting integration scenarios."""
 
-    def test_multiple_ips_concurrent_requests(self):
+    def test_multiple_ips_concurrent_requests(self, make_limiter):
         """Test multiple IPs making concurrent requests."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=2, daily_quota=10)
+        limiter = make_limiter(2, 10)
 
         ips = ["127.0.0.1", "192.168.1.1", "10.0.0.1"]
 
@@ -202,33 +188,14 @@ class TestRateLimitingIntegration:
             with pytest.raises(HTTPException):
                 limiter.check(ip)
 
-    def test_mixed_rate_and_quota_limits(self):
-        """Test interaction between rate and quota limits."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=10, daily_quota=3)
-
-        # Make 3 requests quickly (within rate limit but at quota limit)
-        limiter.check("127.0.0.1")
-        limiter.check("127.0.0.1")
-        limiter.check("127.0.0.1")
-
-        # Should be blocked by daily quota, not rate limit
-        with pytest.raises(HTTPException) as exc_info:
-            limiter.check("127.0.0.1")
-
-        assert "Daily quota exceeded" in str(exc_info.value.detail)
-
-    def test_memory_efficiency(self):
-        """Test that the limiter doesn't leak memory."""
-        limiter = InMemoryRateLimiter(max_requests_per_minute=100, daily_quota=1000)
+    def test_tracked_ips_are_capped(self, make_limiter):
+        """Test that the least recently seen IPs are evicted past max_tracked_ips."""
+        limiter = make_limiter(100, 1000, max_tracked_ips=3)
 
-        # Make requests from many different IPs
-        for i in range(100):
-            ip = f"192.168.1.{i}"
+        for ip in ["10.0.0.1", "10.0.0.2", "10.0.0.3"]:
             limiter.check(ip)
+        limiter.check("10.0.0.1")  # refresh
+        limiter.check("10.0.0.4")
 
-        # Should have tracking data for all IPs
-        assert len(limiter.minute_buckets) == 100
-        assert len(limiter.daily_counts) == 100
-
-        # Note: In a real implementation, you'd want to add cleanup
-        # to prevent memory leaks, but this tests the basic functionality
+        assert list(limiter.minute_buckets) == ["10.0.0.3", "10.0.0.1", "10.0.0.4"]
+        assert list(limiter.daily_counts) == ["10.0.0.3", "10.0.0.1", "10.0.0.4"]
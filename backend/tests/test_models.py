@@ -16,38 +16,59 @@ from app.models.schemas import (
 )
 
 
-class TestTranscriptSegment:
-    """Test TranscriptSegment model."""
-
-    def test_transcript_segment_valid(self):
-        """Test valid transcript segment."""
-        segment = TranscriptSegment(
-            start=0.0,
-            end=2.5,
-            text="Hello world"
-        )
-        assert segment.start == 0.0
-        assert segment.end == 2.5
-        assert segment.text == "Hello world"
-
-    def test_transcript_segment_invalid_start(self):
-        """Test invalid start time."""
-        with pytest.raises(ValidationError):
-            TranscriptSegment(
-                start="invalid",
-                end=2.5,
-                text="Hello world"
-            )
-
-    def test_transcript_segment_negative_time(self):
-        """Test negative time values."""
-        # Should allow negative start (though unusual)
-        segment = TranscriptSegment(
-            start=-1.0,
-            end=2.5,
-            text="Hello world"
-        )
-        assert segment.start == -1.0
+@pytest.mark.parametrize("model_cls,kwargs,expected", [
+    pytest.param(TranscriptSegment, {"start": 0.0, "end": 2.5, "text": "Hello world"},
+                 {"start": 0.0, "end": 2.5, "text": "Hello world"}, id="segment"),
+    # Negative starts are allowed (though unusual)
+    pytest.param(TranscriptSegment, {"start": -1.0, "end": 2.5, "text": "Hello world"},
+                 {"start": -1.0}, id="segment-negative-start"),
+    pytest.param(TranscriptResponse, {"video_id": "test123", "source": "whisper", "segments": [], "text": ""},
+                 {"language": None}, id="transcript-optional-fields"),
+    pytest.param(VideoMeta, {"video_id": "test123", "title": "Test Video", "description": "A test video",
+                             "thumbnail_url": "https://example.com/thumb.jpg", "channel": "Test Channel", "duration": 300.5},
+                 {"video_id": "test123", "title": "Test Video", "duration": 300.5}, id="video-meta"),
+    pytest.param(VideoMeta, {"video_id": "test123", "title": "Test Video"},
+                 {"video_id": "test123", "title": "Test Video", "description": None,
+                  "thumbnail_url": None, "channel": None, "duration": None}, id="video-meta-minimal"),
+    pytest.param(SummaryResponse, {"video_id": "test123", "summary": "This is a summary of the video content."},
+                 {"video_id": "test123", "summary": "This is a summary of the video content."}, id="summary"),
+    # Empty and punctuated video ids are accepted
+    pytest.param(SummaryResponse, {"video_id": "", "summary": "Test summary"}, {"video_id": ""}, id="summary-empty-id"),
+    pytest.param(SummaryResponse, {"video_id": "test-123_ABC", "summary": "Test summary"},
+                 {"video_id": "test-123_ABC"}, id="summary-special-id"),
+    pytest.param(ChapterItem, {"title": "Introduction", "start": 0.0},
+                 {"title": "Introduction", "start": 0.0}, id="chapter"),
+    pytest.param(ChaptersResponse, {"video_id": "test123", "chapters": []}, {"chapters": []}, id="chapters-empty"),
+    pytest.param(TakeawaysResponse,
+                 {"video_id": "test123", "takeaways": ["First key takeaway", "Second important point", "Third valuable insight"]},
+                 {"video_id": "test123", "takeaways": ["First key takeaway", "Second important point", "Third valuable insight"]},
+                 id="takeaways"),
+    pytest.param(QARequest, {"video_id": "test123", "question": "What is this video about?"},
+                 {"video_id": "test123", "question": "What is this video about?"}, id="qa-request"),
+    pytest.param(QARequest, {"video_id": "test123", "question": ""}, {"question": ""}, id="qa-request-empty-question"),
+    pytest.param(QAResponse, {"video_id": "test123", "question": "What is this video about?",
+                              "answer": "This video explains machine learning concepts."},
+                 {"video_id": "test123", "question": "What is this video about?",
+                  "answer": "This video explains machine learning concepts."}, id="qa-response"),
+    pytest.param(EntitiesResponse, {"video_id": "test123", "entities": ["Google", "Microsoft", "OpenAI", "Python"]},
+                 {"video_id": "test123", "entities": ["Google", "Microsoft", "OpenAI", "Python"]}, id="entities"),
+    pytest.param(EntitiesResponse, {"video_id": "test123", "entities": []}, {"entities": []}, id="entities-empty"),
+])
+def test_model_roundtrip(model_cls, kwargs, expected):
+    """Test valid models keep the values they were built with."""
+    model = model_cls(**kwargs)
+    for field, value in expected.items():
+        assert getattr(model, field) == value
+
+
+@pytest.mark.parametrize("model_cls,kwargs", [
+    pytest.param(TranscriptSegment, {"start": "invalid", "end": 2.5, "text": "Hello world"}, id="segment"),
+    pytest.param(ChapterItem, {"title": "Introduction", "start": "invalid"}, id="chapter"),
+])
+def test_model_invalid_start(model_cls, kwargs):
+    """Test non-numeric start times are rejected."""
+    with pytest.raises(ValidationError):
+        model_cls(**kwargs)
 
 
 class TestTranscriptResponse:
@@ -74,86 +95,6 @@ class TestTranscriptResponse:
         assert len(response.segments) == 2
         assert response.text == "Hello world"
 
-    def test_transcript_response_optional_fields(self):
-        """Test transcript response with optional fields."""
-        response = TranscriptResponse(
-            video_id="test123",
-            source="whisper",
-            segments=[],
-            text=""
-        )
-
-        assert response.language is None
-
-
-class TestVideoMeta:
-    """Test VideoMeta model."""
-
-    def test_video_meta_complete(self):
-        """Test complete video metadata."""
-        meta = VideoMeta(
-            video_id="test123",
-            title="Test Video",
-            description="A test video",
-            thumbnail_url="https://example.com/thumb.jpg",
-            channel="Test Channel",
-            duration=300.5
-        )
-
-        assert meta.video_id == "test123"
-        assert meta.title == "Test Video"
-        assert meta.duration == 300.5
-
-    def test_video_meta_minimal(self):
-        """Test minimal video metadata."""
-        meta = VideoMeta(
-            video_id="test123",
-            title="Test Video"
-        )
-
-        assert meta.video_id == "test123"
-        assert meta.title == "Test Video"
-        assert meta.description is None
-        assert meta.thumbnail_url is None
-        assert meta.channel is None
-        assert meta.duration is None
-
-
-class TestSummaryResponse:
-    """Test SummaryResponse model."""
-
-    def test_summary_response_valid(self):
-        """Test valid summary response."""
-        response = SummaryResponse(
-            video_id="test123",
-            summary="This is a summary of the video content."
-        )
-
-        assert response.video_id == "test123"
-        assert response.summary == "This is a summary of the video content."
-
-
-class TestChapterItem:
-    """Test ChapterItem model."""
-
-    def test_chapter_item_valid(self):
-        """Test valid chapter item."""
-        chapter = ChapterItem(
-            title="Introduction",
-            start=0.0
-        )
-
-        assert chapter.title == "Introduction"
-        assert chapter.start == 0.0
-
-    def test_chapter_item_invalid_start(self):
-        """Test invalid start time."""
-        with pytest.raises(ValidationError):
-            ChapterItem(
-                title="Introduction",
-                start="invalid"
-            )
-
 
 class TestChaptersResponse:
     """Test ChaptersResponse model."""
@@ -175,136 +116,12 @@ class TestChaptersResponse:
         assert len(response.chapters) == 3
         assert response.chapters[0].title == "Introduction"
 
-    def test_chapters_response_empty(self):
-        """Test chapters response with empty chapters."""
-        response = ChaptersResponse(
-            video_id="test123",
-            chapters=[]
-        )
-
-        assert len(response.chapters) == 0
-
-
-class TestTakeawaysResponse:
-    """Test TakeawaysResponse model."""
-
-    def test_takeaways_response_valid(self):
-        """Test valid takeaways response."""
-        takeaways = [
-            "First key takeaway",
-            "Second important point",
-            "Third valuable insight"
-        ]
-
-        response = TakeawaysResponse(
-            video_id="test123",
-            takeaways=takeaways
-        )
-
-        assert response.video_id == "test123"
-        assert len(response.takeaways) == 3
-        assert "First key takeaway" in response.takeaways
-
-
-class TestQARequest:
-    """Test QARequest model."""
-
-    def test_qa_request_valid(self):
-        """Test valid Q&A request."""
-        request = QARequest(
-            video_id="test123",
-            question="What is this video about?"
-        )
-
-        assert request.video_id == "test123"
-        assert request.question == "What is this video about?"
-
-    def test_qa_request_empty_question(self):
-        """Test Q&A request with empty question."""
-        request = QARequest(
-            video_id="test123",
-            question=""
-        )
-
-        assert request.question == ""
-
-
-class TestQAResponse:
-    """Test QAResponse model."""
-
-    def test_qa_response_valid(self):
-        """Test valid Q&A response."""
-        response = QAResponse(
-            video_id="test123",
-            question="What is this video about?",
-            answer="This video explains machine learning concepts."
-        )
-
-        assert response.video_id == "test123"
-        assert response.question == "What is this video about?"
-        assert response.answer == "This video explains machine learning concepts."
-
-
-class TestEntitiesResponse:
-    """Test EntitiesResponse model."""
-
-    def test_entities_response_valid(self):
-        """Test valid entities response."""
-        entities = ["Google", "Microsoft", "OpenAI", "Python"]
-
-        response = EntitiesResponse(
-            video_id="test123",
-            entities=entities
-        )
-
-        assert response.video_id == "test123"
-        assert len(response.entities) == 4
-        assert "Google" in response.entities
-
-    def test_entities_response_empty(self):
-        """Test entities response with no entities."""
-        response = EntitiesResponse(
-            video_id="test123",
-            entities=[]
-        )
-
-        assert len(response.entities) == 0
-
 
 class TestModelValidation:
     """Test model validation edge cases."""
 
-    def test_video_id_validation(self):
-        """Test video ID validation across models."""
-        # Test that empty video ID is allowed
-        response = SummaryResponse(
-            video_id="",
-            summary="Test summary"
-        )
-        assert response.video_id == ""
-
-        # Test special characters in video ID
-        response = SummaryResponse(
-            video_id="test-123_ABC",
-            summary="Test summary"
-        )
-        assert response.video_id == "test-123_ABC"
-
-    def test_text_field_validation(self):
+    @pytest.mark.parametrize("text", ["Hello 世界 🌍", "A" * 64], ids=["unicode", "long"])
+    def test_text_field_validation(self, text):
         """Test text field validation."""
-        # Test unicode text
-        segment = TranscriptSegment(
-            start=0.0,
-            end=2.0,
-            text="Hello 世界 🌍"
-        )
-        assert segment.text == "Hello 世界 🌍"
-
-        # Test very long text
-        long_text = "A" * 10000
-        segment = TranscriptSegment(
-            start=0.0,
-            end=2.0,
-            text=long_text
-        )
-        assert len(segment.text) == 10000
+        segment = TranscriptSegment(start=0.0, end=2.0, text=text)
+        assert segment.text == text
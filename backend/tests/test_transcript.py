@@ -1,60 +1,58 @@
 """Tests for transcript service."""
+import asyncio
+import io
 import os
+import sys
 import tempfile
+import threading
+import time
+from types import SimpleNamespace as NS
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from unittest.mock import Mock, patch, MagicMock
 import pytest
+import requests
+from youtube_transcript_api import NoTranscriptFound
 
+from app.services import transcript as transcript_service
 from app.services.transcript import (
     fetch_transcript_via_api,
     extract_youtube_id,
     download_audio_with_ytdlp,
     parse_srt,
+    _parse_srt_stream,
     punctuate_text,
     punctuate_segments,
     get_transcript_pipeline,
     segments_to_text,
+    SegmentArray,
+    _resolve_whisper_paths,
 )
+from app.api.routes import _load_transcript
 from app.models.schemas import TranscriptSegment
 
 
+def _make_mock_api(text, start=0.0, duration=2.5, is_generated=False, lang="en"):
+    """Stand-in YouTubeTranscriptApi listing one transcript with a single snippet."""
+    snippet = NS(text=text, start=start, duration=duration)
+    transcript = NS(fetch=lambda: [snippet], is_generated=is_generated, language_code=lang)
+    return NS(list=lambda video_id: [transcript])
+
+
 class TestYouTubeIDExtraction:
     """Test YouTube ID extraction from various URL formats."""
 
-    def test_extract_youtube_id_watch_url(self):
-        """Test extraction from watch URL."""
-        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
-
-    def test_extract_youtube_id_youtu_be(self):
-        """Test extraction from youtu.be URL."""
-        url = "https://youtu.be/dQw4w9WgXcQ"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
-
-    def test_extract_youtube_id_shorts(self):
-        """Test extraction from shorts URL."""
-        url = "https://www.youtube.com/shorts/dQw4w9WgXcQ"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
-
-    def test_extract_youtube_id_embed(self):
-        """Test extraction from embed URL."""
-        url = "https://www.youtube.com/embed/dQw4w9WgXcQ"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
-
-    def test_extract_youtube_id_live(self):
-        """Test extraction from live URL."""
-        url = "https://www.youtube.com/live/dQw4w9WgXcQ"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
-
-    def test_extract_youtube_id_with_params(self):
-        """Test extraction with additional parameters."""
-        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s&list=PLrAXtmRdnEQy"
-        result = extract_youtube_id(url)
-        assert result == "dQw4w9WgXcQ"
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://www.youtube.com/live/dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s&list=PLrAXtmRdnEQy",
+    ], ids=["watch", "youtu.be", "shorts", "embed", "live", "with-params"])
+    def test_extract_youtube_id(self, url):
+        """Test extraction from each supported URL format."""
+        assert extract_youtube_id(url) == "dQw4w9WgXcQ"
 
     def test_extract_youtube_id_invalid_url(self):
         """Test with invalid URL."""
@@ -68,23 +66,7 @@ class TestTranscriptAPI:
     @patch('app.services.transcript.YouTubeTranscriptApi')
     def test_fetch_transcript_via_api_success(self, mock_api_class):
         """Test successful transcript fetch."""
-        # Mock transcript data
-        mock_snippet = Mock()
-        mock_snippet.text = "Hello world"
-        mock_snippet.start = 0.0
-        mock_snippet.duration = 2.5
-
-        mock_transcript = Mock()
-        mock_transcript.fetch.return_value = [mock_snippet]
-        mock_transcript.is_generated = False
-        mock_transcript.language_code = "en"
-
-        mock_transcript_list = Mock()
-        mock_transcript_list.find_transcript.return_value = mock_transcript
-
-        mock_api = Mock()
-        mock_api.list.return_value = mock_transcript_list
-        mock_api_class.return_value = mock_api
+        mock_api_class.return_value = _make_mock_api("Hello world")
 
         segments, source, lang = fetch_transcript_via_api("test_video_id")
 
@@ -98,32 +80,52 @@ class TestTranscriptAPI:
     @patch('app.services.transcript.YouTubeTranscriptApi')
     def test_fetch_transcript_via_api_auto_generated(self, mock_api_class):
         """Test auto-generated transcript detection."""
-        mock_snippet = Mock()
-        mock_snippet.text = "Auto generated text"
-        mock_snippet.start = 0.0
-        mock_snippet.duration = 1.0
+        mock_api_class.return_value = _make_mock_api("Auto generated text", duration=1.0, is_generated=True)
 
-        mock_transcript = Mock()
-        mock_transcript.fetch.return_value = [mock_snippet]
-        mock_transcript.is_generated = True
-        mock_transcript.language_code = "en"
+        segments, source, lang = fetch_transcript_via_api("test_video_id")
 
-        mock_transcript_list = Mock()
-        mock_transcript_list.find_transcript.return_value = mock_transcript
+        assert source == "youtube-auto"
+
+    @patch('app.services.transcript.YouTubeTranscriptApi')
+    def test_fetch_transcript_via_api_prefers_english(self, mock_api_class):
+        """Test English is picked over earlier non-English transcripts, else the first one."""
+        snippet = NS(text="Hallo", start=1.0, duration=1.0)
+        german = NS(fetch=lambda: [snippet], is_generated=False, language_code="de")
+        english = NS(fetch=lambda: [snippet], is_generated=True, language_code="en-GB")
 
         mock_api = Mock()
-        mock_api.list.return_value = mock_transcript_list
+        mock_api.list.return_value = [german, english]
         mock_api_class.return_value = mock_api
 
         segments, source, lang = fetch_transcript_via_api("test_video_id")
+        assert (source, lang) == ("youtube-auto", "en-GB")
+        assert segments[0].end == 2.0
 
-        assert source == "youtube-auto"
+        mock_api.list.return_value = [german]
+        assert fetch_transcript_via_api("test_video_id")[1:] == ("youtube-manual", "de")
+
+        mock_api.list.return_value = []
+        assert fetch_transcript_via_api("test_video_id") == ([], "missing", None)
+
+    @patch('app.services.transcript.YouTubeTranscriptApi')
+    def test_fetch_transcript_uses_shared_session(self, mock_api_class):
+        """Test fetches reuse one HTTP session: the one passed in, else the thread's own."""
+        mock_api_class.return_value = _make_mock_api("Hello world")
+        shared = requests.Session()
+
+        fetch_transcript_via_api("video_a", session=shared)
+        fetch_transcript_via_api("video_b", session=shared)
+        fetch_transcript_via_api("video_a")
+        fetch_transcript_via_api("video_b")
+
+        clients = [c.kwargs["http_client"] for c in mock_api_class.call_args_list]
+        assert clients[0] is shared and clients[1] is shared
+        assert clients[2] is clients[3] is not shared
+        assert isinstance(clients[2], requests.Session)
 
     @patch('app.services.transcript.YouTubeTranscriptApi')
     def test_fetch_transcript_via_api_no_transcript(self, mock_api_class):
         """Test when no transcript is available."""
-        from youtube_transcript_api import NoTranscriptFound
-
         mock_api = Mock()
         mock_api.list.side_effect = NoTranscriptFound("test_video_id", [], [])
         mock_api_class.return_value = mock_api
@@ -138,66 +140,38 @@ class TestTranscriptAPI:
 class TestSRTParsing:
     """Test SRT file parsing."""
 
-    def test_parse_srt_valid_file(self):
-        """Test parsing valid SRT file."""
-        srt_content = """1
-00:00:00,000 --> 00:00:02,500
-Hello world
-
-2
-00:00:02,500 --> 00:00:05,000
-This is a test
-
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.srt', delete=False) as f:
-            f.write(srt_content)
-            f.flush()
-
-            segments = parse_srt(f.name)
-
-            assert len(segments) == 2
-            assert segments[0].text == "Hello world"
-            assert segments[0].start == 0.0
-            assert segments[0].end == 2.5
-            assert segments[1].text == "This is a test"
-            assert segments[1].start == 2.5
-            assert segments[1].end == 5.0
-
-            os.unlink(f.name)
-
-    def test_parse_srt_empty_file(self):
+    @pytest.mark.parametrize("srt_content,expected", [
+        pytest.param(
+            "1\n00:00:00,000 --> 00:00:02,500\nHello world\n\n2\n00:00:02,500 --> 00:00:05,000\nThis is a test\n\n",
+            [(0.0, 2.5, "Hello world"), (2.5, 5.0, "This is a test")],
+            id="valid",
+        ),
+        # Cue settings after the end time, or no spaces around the arrow
+        pytest.param(
+            "1\n00:00:01,000 --> 00:00:02,000 X1:10 X2:20\nFirst\n\n2\n00:00:03,250-->00:00:04,750\nSecond\n",
+            [(1.0, 2.0, "First"), (3.25, 4.75, "Second")],
+            id="irregular-timing",
+        ),
+    ])
+    def test_parse_srt_stream(self, srt_content, expected):
+        """Test parsing SRT content into segments."""
+        segments = _parse_srt_stream(io.StringIO(srt_content))
+        assert [(s.start, s.end, s.text) for s in segments] == expected
+
+    def test_parse_srt_empty_file(self, tmp_path):
         """Test parsing empty SRT file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.srt', delete=False) as f:
-            f.write("")
-            f.flush()
+        srt_path = tmp_path / "empty.srt"
+        srt_path.write_text("", encoding="utf-8")
 
-            segments = parse_srt(f.name)
-            assert segments == []
-
-            os.unlink(f.name)
+        assert parse_srt(str(srt_path)) == []
 
 
 class TestPunctuation:
     """Test punctuation restoration."""
 
-    def test_punctuate_text_success(self):
+    def test_punctuate_text_success(self, fake_punctuation):
         """Test successful punctuation restoration."""
-        # Mock the deepmultilingualpunctuation import and usage
-        with patch('builtins.__import__') as mock_import:
-            mock_model = Mock()
-            mock_model.restore_punctuation.return_value = "Hello, world! How are you?"
-
-            def import_side_effect(name, *args, **kwargs):
-                if name == 'deepmultilingualpunctuation':
-                    mock_module = Mock()
-                    mock_module.PunctuationModel.return_value = mock_model
-                    return mock_module
-                return __import__(name, *args, **kwargs)
-
-            mock_import.side_effect = import_side_effect
-
-            result = punctuate_text("hello world how are you")
-            assert result == "Hello, world! How are you?"
+        assert punctuate_text("hello world how are you") == "Hello world how are you."
 
     def test_punctuate_text_failure(self):
         """Test punctuation restoration failure fallback."""
@@ -223,92 +197,261 @@ class TestPunctuation:
             assert len(result) >= 1
             assert any("Hello" in seg.text for seg in result)
 
+    def test_punctuate_segments_single_model_call(self):
+        """Test all segments are punctuated in one call and split back on the sentinel."""
+        segments = [
+            TranscriptSegment(start=0.0, end=1.0, text="hello"),
+            TranscriptSegment(start=1.0, end=2.0, text="how  are you"),
+            TranscriptSegment(start=2.0, end=3.0, text="fine"),
+        ]
+
+        with patch('app.services.transcript.punctuate_text') as mock_punctuate:
+            mock_punctuate.return_value = "hello, |||. how are you? ||| fine."
+
+            result = punctuate_segments(segments)
+
+        mock_punctuate.assert_called_once_with("hello ||| how are you ||| fine")
+        assert [(s.start, s.text) for s in result] == [(0.0, "hello,"), (1.0, "how are you?"), (2.0, "fine.")]
+
+    def test_punctuate_text_does_not_retry_failed_model_load(self, monkeypatch):
+        """Test a failed model import is remembered instead of retried on every call."""
+        monkeypatch.setattr(transcript_service, "_punct_model", None)
+        monkeypatch.setattr(transcript_service, "_punct_model_failed", False)
+        # A None entry makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, "deepmultilingualpunctuation", None)
+
+        assert punctuate_text("hello world") == "hello world"
+        assert transcript_service._punct_model_failed
+
+        with patch('builtins.__import__') as mock_import:
+            assert punctuate_text("hello world") == "hello world"
+        mock_import.assert_not_called()
+
 
 class TestAudioDownload:
     """Test audio download functionality."""
 
     @patch('app.services.transcript.subprocess.run')
     @patch('app.services.transcript.os.listdir')
-    def test_download_audio_with_ytdlp_success(self, mock_listdir, mock_subprocess):
+    def test_download_audio_with_ytdlp_success(self, mock_listdir, mock_subprocess, shared_tmp_dir):
         """Test successful audio download."""
         mock_subprocess.return_value = Mock()
         mock_listdir.return_value = ["test_video_id.wav"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = download_audio_with_ytdlp("test_video_id", temp_dir)
-            expected_path = os.path.join(temp_dir, "test_video_id.wav")
-            assert result == expected_path
+        result = download_audio_with_ytdlp("test_video_id", shared_tmp_dir)
+        expected_path = os.path.join(shared_tmp_dir, "test_video_id.wav")
+        assert result == expected_path
 
     @patch('app.services.transcript.subprocess.run')
     @patch('app.services.transcript.os.listdir')
-    def test_download_audio_with_ytdlp_no_file(self, mock_listdir, mock_subprocess):
+    def test_download_audio_with_ytdlp_no_file(self, mock_listdir, mock_subprocess, shared_tmp_dir):
         """Test audio download when no file is created."""
         mock_subprocess.return_value = Mock()
         mock_listdir.return_value = []  # No files created
 
+        with patch.dict('os.environ', {}, clear=False):  # Clear test env var
+            with pytest.raises(FileNotFoundError):
+                download_audio_with_ytdlp("test_video_id", shared_tmp_dir)
+
+
+class TestWhisperPaths:
+    """Test whisper-cpp model/binary resolution."""
+
+    def test_resolve_whisper_paths_cached(self):
+        """Test resolution (including misses) is probed once per setting."""
+        _resolve_whisper_paths.cache_clear()
         with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.dict('os.environ', {}, clear=False):  # Clear test env var
-                with pytest.raises(FileNotFoundError):
-                    download_audio_with_ytdlp("test_video_id", temp_dir)
+            model = os.path.join(temp_dir, "model.bin")
+            with open(model, "wb"):
+                pass
+            binary = os.path.join(temp_dir, "whisper")
+            with open(binary, "w") as f:
+                f.write("#!/bin/sh\n")
+            os.chmod(binary, 0o755)
+
+            assert _resolve_whisper_paths(binary, model) == (model, binary)
+            assert _resolve_whisper_paths("missing", os.path.join(temp_dir, "nope.bin")) == (None, None)
+            with patch('app.services.transcript.os.path.isfile') as mock_isfile:
+                assert _resolve_whisper_paths(binary, model) == (model, binary)
+                assert _resolve_whisper_paths("missing", os.path.join(temp_dir, "nope.bin")) == (None, None)
+                mock_isfile.assert_not_called()
+        _resolve_whisper_paths.cache_clear()
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Mock the pipeline's fetch, download, whisper and punctuation steps on an empty memory cache."""
+    mocks = NS(
+        fetch=Mock(),
+        download=Mock(return_value="/tmp/audio.wav"),
+        whisper=Mock(),
+        punctuate=Mock(side_effect=lambda segs, **kw: segs),
+    )
+    monkeypatch.setattr(transcript_service, "fetch_transcript_via_api", mocks.fetch)
+    monkeypatch.setattr(transcript_service, "download_audio_with_ytdlp", mocks.download)
+    monkeypatch.setattr(transcript_service, "run_whisper_cpp", mocks.whisper)
+    monkeypatch.setattr(transcript_service, "punctuate_segments", mocks.punctuate)
+    monkeypatch.setattr(transcript_service, "_transcript_cache", OrderedDict())
+    return mocks
 
 
 class TestTranscriptPipeline:
     """Test the complete transcript pipeline."""
 
-    @patch('app.services.transcript.fetch_transcript_via_api')
-    @patch('app.services.transcript.punctuate_segments')
-    def test_get_transcript_pipeline_youtube_success(self, mock_punctuate, mock_fetch):
+    def test_get_transcript_pipeline_youtube_success(self, pipeline, long_transcript_segments):
         """Test pipeline with successful YouTube transcript."""
         # Use a longer text to avoid whisper fallback
-        segments = [TranscriptSegment(start=0.0, end=2.0, text="Hello world this is a longer transcript that should not trigger whisper fallback because it has sufficient content")]
-        mock_fetch.return_value = (segments, "youtube-manual", "en")
-        mock_punctuate.return_value = segments
+        segments = long_transcript_segments
+        pipeline.fetch.return_value = (segments, "youtube-manual", "en")
 
-        result_segments, source, lang = get_transcript_pipeline("test_video_id")
+        result_segments, text, source, lang = get_transcript_pipeline("test_video_id")
 
         assert len(result_segments) == 1
+        assert text == segments[0].text
         assert source == "youtube-manual"
         assert lang == "en"
-        mock_punctuate.assert_called_once()
+        pipeline.punctuate.assert_called_once()
+        pipeline.download.assert_not_called()
 
-    @patch('app.services.transcript.fetch_transcript_via_api')
-    @patch('app.services.transcript.download_audio_with_ytdlp')
-    @patch('app.services.transcript.run_whisper_cpp')
-    @patch('app.services.transcript.punctuate_segments')
-    def test_get_transcript_pipeline_whisper_fallback(self, mock_punctuate, mock_whisper, mock_download, mock_fetch):
-        """Test pipeline with whisper fallback."""
-        # YouTube API returns no transcript
-        mock_fetch.return_value = ([], "missing", None)
+    @pytest.mark.parametrize("flag, expected", [(False, False), (True, True)])
+    def test_get_transcript_pipeline_auto_captions_punctuation_flag(
+        self, pipeline, monkeypatch, long_transcript_segments, flag, expected
+    ):
+        """Test auto captions only go through the punctuation model when it is enabled."""
+        monkeypatch.setattr(transcript_service, "_RESTORE_PUNCTUATION", flag)
+        pipeline.fetch.return_value = (long_transcript_segments, "youtube-auto", "en")
+
+        get_transcript_pipeline("test_video_id")
 
-        # Whisper produces transcript
-        whisper_segments = [TranscriptSegment(start=0.0, end=2.0, text="Whisper transcript")]
-        mock_download.return_value = "/tmp/audio.wav"
-        mock_whisper.return_value = whisper_segments
-        mock_punctuate.return_value = whisper_segments
+        assert pipeline.punctuate.call_args.kwargs == {"restore_punctuation": expected}
 
-        result_segments, source, lang = get_transcript_pipeline("test_video_id")
+    def test_get_transcript_pipeline_whisper_fallback(self, pipeline, whisper_segments):
+        """Test pipeline with whisper fallback."""
+        # YouTube API returns no transcript; whisper produces one
+        pipeline.fetch.return_value = ([], "missing", None)
+        pipeline.whisper.return_value = whisper_segments
+
+        result_segments, text, source, lang = get_transcript_pipeline("test_video_id")
 
         assert len(result_segments) == 1
+        assert text == "Whisper transcript"
         assert source == "whisper"
         assert lang == "en"
-        mock_download.assert_called_once()
-        mock_whisper.assert_called_once()
+        pipeline.download.assert_called_once()
+        pipeline.whisper.assert_called_once()
+
+    def test_get_transcript_pipeline_cache_evicts_least_recent(self, pipeline, monkeypatch, long_transcript_segments):
+        """Test the transcript cache drops the least recently used video past its cap."""
+        monkeypatch.setattr(transcript_service, "_TRANSCRIPT_CACHE_MAX_ENTRIES", 2)
+        pipeline.fetch.return_value = (long_transcript_segments, "youtube-manual", "en")
+
+        get_transcript_pipeline("video_a")
+        get_transcript_pipeline("video_b")
+        get_transcript_pipeline("video_a")  # hit; video_b is now least recent
+        get_transcript_pipeline("video_c")
+
+        assert list(transcript_service._transcript_cache) == ["video_a", "video_c"]
+        assert pipeline.fetch.call_count == 3
+
+    def test_get_transcript_pipeline_cache_concurrent_eviction(self, pipeline, monkeypatch, long_transcript_segments):
+        """Test concurrent hits and evictions on a tiny cache never raise."""
+        monkeypatch.setattr(transcript_service, "_TRANSCRIPT_CACHE_MAX_ENTRIES", 2)
+        pipeline.fetch.return_value = (long_transcript_segments, "youtube-manual", "en")
+
+        video_ids = [f"video_{i % 5}" for i in range(400)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(get_transcript_pipeline, video_ids))
+
+        assert all(source == "youtube-manual" for _segs, _text, source, _lang in results)
+        assert len(transcript_service._transcript_cache) <= 2
+
+    def test_get_transcript_pipeline_disk_cache(self, pipeline, monkeypatch, tmp_path, long_transcript_segments):
+        """Test transcripts written to the sqlite cache are served after the memory cache is lost."""
+        segments = long_transcript_segments
+        pipeline.fetch.return_value = (segments, "youtube-manual", "en")
+        monkeypatch.setattr(transcript_service, "_TRANSCRIPT_CACHE_DB", str(tmp_path / "transcripts.db"))
+        monkeypatch.setattr(transcript_service, "_disk_conn", None)
+
+        get_transcript_pipeline("disk_video")
+        transcript_service._transcript_cache.clear()  # simulate a restart
+
+        result_segments, text, source, lang = get_transcript_pipeline("disk_video")
+
+        assert pipeline.fetch.call_count == 1
+        assert [(s.start, s.end, s.text) for s in result_segments] == [(0.0, 2.0, segments[0].text)]
+        assert text == segments[0].text
+        assert (source, lang) == ("youtube-manual", "en")
+
+    def test_get_transcript_pipeline_coalesces_concurrent_fetches(self, pipeline, long_transcript_segments):
+        """Test concurrent requests for the same uncached video share one fetch."""
+        segments = long_transcript_segments
+
+        def slow_fetch(video_id):
+            time.sleep(0.2)
+            return segments, "youtube-manual", "en"
+
+        pipeline.fetch.side_effect = slow_fetch
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(get_transcript_pipeline, ["shared_video"] * 4))
+
+        assert pipeline.fetch.call_count == 1
+        assert all(r[1] == segments[0].text for r in results)
+
+    def test_get_transcript_pipeline_speculative_audio(self, pipeline, monkeypatch, whisper_segments):
+        """Test the speculatively downloaded audio feeds whisper when captions are missing."""
+        monkeypatch.setattr(transcript_service, "_SPECULATIVE_AUDIO", True)
+        pipeline.fetch.return_value = ([], "missing", None)
+        pipeline.whisper.return_value = whisper_segments
+
+        _, text, source, _ = get_transcript_pipeline("speculative_video")
+
+        assert (text, source) == ("Whisper transcript", "whisper")
+        pipeline.download.assert_called_once()
+        pipeline.whisper.assert_called_once_with("/tmp/audio.wav", pipeline.download.call_args[0][1])
+
+    @pytest.mark.asyncio
+    async def test_load_transcripts_concurrently(self, pipeline, long_transcript_segments):
+        """Test the routes' async loader runs fetches for different videos in parallel."""
+        video_ids = ["video_1", "video_2", "video_3"]
+        # Every fetch waits for the others; a serialized loader would break the barrier
+        barrier = threading.Barrier(len(video_ids), timeout=5)
+
+        def fetch(video_id):
+            barrier.wait()
+            return list(long_transcript_segments), "youtube-manual", "en"
+
+        pipeline.fetch.side_effect = fetch
+
+        results = await asyncio.gather(*(_load_transcript(v) for v in video_ids))
+
+        assert pipeline.fetch.call_count == len(video_ids)
+        assert all(text == long_transcript_segments[0].text and source == "youtube-manual" for _, text, source, _ in results)
 
 
 class TestUtilityFunctions:
     """Test utility functions."""
 
-    def test_segments_to_text(self):
+    def test_segments_to_text(self, hello_world_segments):
         """Test converting segments to text."""
-        segments = [
-            TranscriptSegment(start=0.0, end=2.0, text="Hello"),
-            TranscriptSegment(start=2.0, end=4.0, text="world"),
-        ]
-
-        result = segments_to_text(segments)
+        result = segments_to_text(hello_world_segments)
         assert result == "Hello world"
 
     def test_segments_to_text_empty(self):
         """Test converting empty segments to text."""
         result = segments_to_text([])
         assert result == ""
+
+    def test_segment_array_round_trip(self):
+        """Test segments survive conversion to parallel arrays and back."""
+        segments = [
+            TranscriptSegment(start=0.0, end=2.0, text="Hello"),
+            TranscriptSegment(start=2.0, end=4.5, text="world"),
+        ]
+
+        arr = SegmentArray.from_segments(segments)
+
+        assert len(arr) == 2
+        assert list(arr.starts) == [0.0, 2.0]
+        assert arr.text() == segments_to_text(segments)
+        assert [(s.start, s.end, s.text) for s in arr.to_segments()] == [(0.0, 2.0, "Hello"), (2.0, 4.5, "world")]
@@ -0,0 +1,13 @@
+"""Benchmarks for transcript helpers (pytest-benchmark)."""
+from app.models.schemas import TranscriptSegment
+from app.services.transcript import segments_to_text
+
+
+def test_segments_to_text_scales(benchmark):
+    """Test joining a long transcript stays a single linear pass."""
+    segments = [TranscriptSegment(start=float(i), end=float(i + 1), text="word") for i in range(10_000)]
+
+    result = benchmark(segments_to_text, segments)
+
+    assert result.startswith("word word")
+    assert len(result) == 10_000 * len("word ") - 1